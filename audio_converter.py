@@ -2,8 +2,11 @@ import os
 import sys
 import wave
 import json
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator
 import speech_recognition as sr
 from pydub import AudioSegment
 from pydub.utils import which
@@ -26,6 +29,10 @@ class AudioToTextConverter:
             '.aac', '.wma', '.aiff', '.au', '.3gp'
         }
         self.whisper_model = None
+        # Whisper inference and the shared recognizer are not safe to use from
+        # several batch workers at once
+        self._whisper_lock = threading.Lock()
+        self._recognizer_lock = threading.Lock()
         
     def load_whisper_model(self, model_name: str = "base") -> bool:
         """
@@ -103,7 +110,7 @@ class AudioToTextConverter:
             str: Transcribed text
         """
         try:
-            with sr.AudioFile(audio_path) as source:
+            with self._recognizer_lock, sr.AudioFile(audio_path) as source:
                 # Adjust for ambient noise
                 self.recognizer.adjust_for_ambient_noise(source)
                 audio_data = self.recognizer.record(source)
@@ -139,7 +146,8 @@ class AudioToTextConverter:
                 return "Error: Whisper model not available"
         
         try:
-            result = self.whisper_model.transcribe(audio_path, language=language)
+            with self._whisper_lock:
+                result = self.whisper_model.transcribe(audio_path, language=language)
             logger.info("Whisper transcription completed successfully")
             return result["text"].strip()
             
@@ -166,7 +174,9 @@ class AudioToTextConverter:
                 chunk_end = min(chunk_start + chunk_length_ms, len(audio))
                 chunk = audio[chunk_start:chunk_end]
                 
-                chunk_path = f"{audio_path}_chunk_{i:03d}.wav"
+                # Unique names so files with the same stem never share chunk paths
+                fd, chunk_path = tempfile.mkstemp(suffix=f"_chunk_{i:03d}.wav")
+                os.close(fd)
                 chunk.export(chunk_path, format="wav")
                 chunks.append(chunk_path)
                 
@@ -204,6 +214,10 @@ class AudioToTextConverter:
             "chunks": []
         }
         
+        # Convert to WAV if necessary
+        wav_path = input_path
+        temp_wav = False
+        
         try:
             # Check if file exists and is supported
             if not os.path.exists(input_path):
@@ -212,13 +226,12 @@ class AudioToTextConverter:
             if not self.is_supported_format(input_path):
                 raise ValueError(f"Unsupported audio format: {Path(input_path).suffix}")
             
-            # Convert to WAV if necessary
-            wav_path = input_path
-            temp_wav = False
-            
             if Path(input_path).suffix.lower() != '.wav':
-                wav_path = self.convert_to_wav(input_path)
+                # A temp name, not input.wav, so talk.mp3 and talk.flac never overwrite each other
+                fd, wav_path = tempfile.mkstemp(suffix='.wav')
+                os.close(fd)
                 temp_wav = True
+                wav_path = self.convert_to_wav(input_path, wav_path)
             
             # Transcribe based on selected engine
             if engine.lower() == "whisper":
@@ -269,35 +282,57 @@ class AudioToTextConverter:
                 else:
                     result["text"] = self.transcribe_with_google(wav_path, language)
             
-            # Clean up temporary WAV file
-            if temp_wav and os.path.exists(wav_path):
-                try:
-                    os.remove(wav_path)
-                except:
-                    pass
-            
             result["success"] = True
             logger.info(f"Successfully transcribed {input_path}")
             
         except Exception as e:
             result["error"] = str(e)
             logger.error(f"Error transcribing {input_path}: {str(e)}")
+        finally:
+            # Clean up temporary WAV file, including one left by a failed conversion
+            if temp_wav and os.path.exists(wav_path):
+                try:
+                    os.remove(wav_path)
+                except:
+                    pass
         
         return result
     
+    def iter_audio_files(self, input_dir: str) -> Iterator[str]:
+        """
+        Lazily yield supported audio files in a directory.
+        
+        Args:
+            input_dir: Directory containing audio files
+            
+        Yields:
+            str: Path to each supported audio file
+        """
+        extensions = tuple(self.supported_formats)
+        with os.scandir(input_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.lower().endswith(extensions):
+                    yield entry.path
+    
     def batch_transcribe(self, 
                         input_dir: str, 
                         output_dir: str = None,
                         engine: str = "google",
-                        language: str = "en-US") -> List[Dict[str, Any]]:
+                        language: str = "en-US",
+                        max_workers: int = 1) -> List[Dict[str, Any]]:
         """
         Transcribe multiple audio files in a directory.
         
+        Files are enumerated lazily and handed to a thread pool, so the first
+        transcription starts before the directory scan finishes. Whisper
+        inference is serialized, so extra workers mainly help the Google engine.
+        
         Args:
             input_dir: Directory containing audio files
             output_dir: Directory to save transcription files
             engine: Recognition engine to use
             language: Language code
+            max_workers: Number of files transcribed concurrently
             
         Returns:
             List[Dict]: Results for each file
@@ -307,25 +342,25 @@ class AudioToTextConverter:
         
         os.makedirs(output_dir, exist_ok=True)
         
-        results = []
-        audio_files = []
-        
-        # Find all audio files
-        for ext in self.supported_formats:
-            audio_files.extend(Path(input_dir).glob(f"*{ext}"))
+        # Load the model up front so worker threads don't race to load it
+        if engine.lower() == "whisper" and self.whisper_model is None:
+            self.load_whisper_model()
         
-        logger.info(f"Found {len(audio_files)} audio files to transcribe")
-        
-        for audio_file in audio_files:
-            result = self.transcribe_file(str(audio_file), engine, language)
-            results.append(result)
+        def transcribe_and_save(audio_file: str) -> Dict[str, Any]:
+            result = self.transcribe_file(audio_file, engine, language)
             
             # Save transcription to file
             if result["success"]:
-                output_file = Path(output_dir) / f"{audio_file.stem}.txt"
+                output_file = Path(output_dir) / f"{Path(audio_file).stem}.txt"
                 with open(output_file, 'w', encoding='utf-8') as f:
                     f.write(result["text"])
                 logger.info(f"Saved transcription to {output_file}")
+            return result
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(transcribe_and_save, self.iter_audio_files(input_dir)))
+        
+        logger.info(f"Transcribed {len(results)} audio files")
         
         # Save summary report
         summary_file = Path(output_dir) / "transcription_summary.json"
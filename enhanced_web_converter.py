@@ -11,6 +11,7 @@ import time
 import os
 import tempfile
 import traceback
+from io import BytesIO
 from http.server import HTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
 
@@ -23,6 +24,14 @@ except ImportError:
     WHISPER_AVAILABLE = False
     print("⚠ Warning: Whisper not available")
 
+# Optional: torchaudio decodes live chunks in-process instead of via a temp file
+try:
+    import torch
+    from torchaudio.io import StreamReader
+    TORCHAUDIO_AVAILABLE = True
+except ImportError:
+    TORCHAUDIO_AVAILABLE = False
+
 # Global variables for managing transcription jobs and live audio
 transcription_jobs = {}
 job_counter = 0
@@ -33,6 +42,11 @@ live_transcription_active = False
 live_transcript_buffer = []
 live_audio_queue = queue.Queue()
 
+# Whisper model shared by uploads and live chunks, loaded on first use. The lock
+# covers loading and inference, since one model is not safe to run from two threads
+whisper_model = None
+whisper_lock = threading.Lock()
+
 class AudioTranscriptionHandler(BaseHTTPRequestHandler):
     def do_GET(self):
         """Handle GET requests."""
@@ -178,16 +192,31 @@ class AudioTranscriptionHandler(BaseHTTPRequestHandler):
             audio_data = base64.b64decode(data['audio'])
             
             # Process audio with Whisper
-            if WHISPER_AVAILABLE:
+            if WHISPER_AVAILABLE and TORCHAUDIO_AVAILABLE:
+                # Decode, downmix and resample in memory, then transcribe the samples
+                samples = decode_live_chunk(audio_data)
+                text = ""
+                if samples is not None:
+                    with whisper_lock:
+                        text = get_whisper_model().transcribe(samples)["text"].strip()
+                
+                if text:
+                    live_transcript_buffer.append(text)
+                    # Keep only last 50 segments to avoid memory issues
+                    if len(live_transcript_buffer) > 50:
+                        live_transcript_buffer = live_transcript_buffer[-50:]
+                
+                response = {'status': 'success', 'text': text}
+            elif WHISPER_AVAILABLE:
                 # Save audio to temporary file
                 with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
                     temp_file.write(audio_data)
                     temp_path = temp_file.name
                 
                 try:
-                    # Load model and transcribe
-                    model = whisper.load_model("base")
-                    result = model.transcribe(temp_path)
+                    # Transcribe with the shared model
+                    with whisper_lock:
+                        result = get_whisper_model().transcribe(temp_path)
                     text = result["text"].strip()
                     
                     if text:
@@ -248,7 +277,8 @@ class AudioTranscriptionHandler(BaseHTTPRequestHandler):
             
             print(f"Loading Whisper model for job {job_id}...")
             try:
-                model = whisper.load_model("base")  # Using the already imported whisper module
+                with whisper_lock:
+                    model = get_whisper_model()
             except Exception as model_error:
                 print(f"Failed to load Whisper model: {model_error}")
                 transcription_jobs[job_id]['status'] = 'error'
@@ -260,7 +290,8 @@ class AudioTranscriptionHandler(BaseHTTPRequestHandler):
             # Transcribe audio
             print(f"Transcribing audio for job {job_id}...")
             try:
-                result = model.transcribe(temp_path, fp16=False)  # Disable fp16 for better compatibility
+                with whisper_lock:
+                    result = model.transcribe(temp_path, fp16=False)  # Disable fp16 for better compatibility
                 text = result["text"].strip()
                 
                 if not text:
@@ -1118,6 +1149,20 @@ class AudioTranscriptionHandler(BaseHTTPRequestHandler):
 </html>
         """
 
+def get_whisper_model():
+    """Return the shared Whisper model, loading it on first use. Call with whisper_lock held."""
+    global whisper_model
+    if whisper_model is None:
+        whisper_model = whisper.load_model("base")
+    return whisper_model
+
+def decode_live_chunk(audio_data):
+    """Decode a WebM/Opus chunk to 16 kHz mono float32 samples in a single pass."""
+    reader = StreamReader(BytesIO(audio_data))
+    reader.add_basic_audio_stream(frames_per_chunk=16000, sample_rate=16000, num_channels=1)
+    chunks = [chunk[:, 0] for (chunk,) in reader.stream() if chunk is not None]
+    return torch.cat(chunks) if chunks else None
+
 def check_whisper_available():
     """Check if OpenAI Whisper is available."""
     return WHISPER_AVAILABLE
@@ -5,7 +5,6 @@ Simple example script demonstrating how to use the Audio to Text Converter.
 from audio_converter import AudioToTextConverter
 from audio_utils import AudioAnalyzer
 import os
-from pathlib import Path
 
 def example_basic_usage():
     """Basic usage example."""
@@ -129,23 +128,18 @@ def example_batch_processing():
         print(f"Please add audio files to '{audio_dir}' directory and run this example again.")
         return
     
-    # Check if there are audio files
-    audio_extensions = {'.mp3', '.wav', '.flac', '.m4a', '.ogg'}
-    audio_files = []
-    for ext in audio_extensions:
-        audio_files.extend(Path(audio_dir).glob(f"*{ext}"))
+    # Initialize converter
+    converter = AudioToTextConverter()
     
-    if not audio_files:
+    # Check if there are audio files (stops at the first match)
+    if next(converter.iter_audio_files(audio_dir), None) is None:
         print(f"No audio files found in '{audio_dir}' directory.")
         print("Please add some audio files and try again.")
         return
     
-    print(f"Found {len(audio_files)} audio files for batch processing...")
-    
-    # Initialize converter
-    converter = AudioToTextConverter()
+    print("Starting batch processing...")
     
-    # Batch transcribe
+    # Batch transcribe (files are enumerated lazily)
     results = converter.batch_transcribe(
         input_dir=audio_dir,
         output_dir=output_dir,
@@ -4,8 +4,13 @@ Analyzes meeting notes and generates summaries with action items
 """
 
 import os
+import asyncio
 import tempfile
 import re
+import hashlib
+from bisect import bisect_right
+from itertools import accumulate
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 import argparse
@@ -33,16 +38,101 @@ except ImportError:
     OPENAI_AVAILABLE = False
     print("⚠️  OpenAI not available. Install with: pip install openai")
 
+# Optional: Aho-Corasick automaton scans for all action keywords in one pass
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Optional: RE2 matches the date pattern in linear time
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+ACTION_KEYWORDS = ['action', 'todo', 'task', 'assign', 'responsible', 'deadline', 'due']
+
+_DATE_PATTERN = r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b'
+_DATE_RE = re2.compile(_DATE_PATTERN) if RE2_AVAILABLE else re.compile(_DATE_PATTERN)
+# Markdown line kinds for the Word document; the first matching alternative wins
+_LINE_KIND_RE = re.compile(
+    r'(?P<bold>(?=.*\*\*$)\*\*)'  # **Heading**
+    r'|(?P<h1># )'                  # Markdown heading
+    r'|(?P<h2>## )'                 # Markdown subheading
+    r'|(?P<bullet>[-*] )'           # Bullet point
+    r'|(?P<number>\d+\.\s)'         # Numbered list
+    r'|(?P<skip>#|$)'               # Empty line or other markdown header
+)
+_LINE_HANDLERS = {
+    'bold': lambda doc, line: doc.add_heading(line.replace('**', ''), level=1),
+    'h1': lambda doc, line: doc.add_heading(line.replace('# ', ''), level=1),
+    'h2': lambda doc, line: doc.add_heading(line.replace('## ', ''), level=2),
+    'bullet': lambda doc, line: doc.add_paragraph(line[2:], style='List Bullet'),
+    'number': lambda doc, line: doc.add_paragraph(line, style='List Number'),
+    'skip': lambda doc, line: None,
+    'paragraph': lambda doc, line: doc.add_paragraph(line),
+}
+_TOKEN_RE = re.compile(r'\S+')
+_NAME_RE = re.compile(r'\b[A-Z][a-z]{2,}\b')
+
+# Number of distinct texts whose local analysis stats are kept
+LOCAL_STATS_CACHE_SIZE = 64
+
+# Analysis prompts are assembled as prefix + notes + suffix
+_PROMPT_PREFIX = """
+Analyze the following meeting notes and provide a comprehensive summary:
+
+**Meeting Notes:**
+"""
+
+_MERGE_PROMPT_PREFIX = """
+The following are analyses of consecutive parts of one meeting. Merge them into a single comprehensive summary, removing duplicates across parts:
+
+"""
+
+_PROMPT_SUFFIX = """
+
+**Please provide:**
+
+1. **Executive Summary** (2-3 sentences)
+2. **Key Discussion Points** (bullet points)
+3. **Action Items** (format: Task | Assignee | Due Date | Priority)
+4. **Decisions Made** (clear decisions reached)
+5. **Risks/Concerns** (if any mentioned)
+6. **Next Steps** (immediate follow-ups)
+7. **Meeting Metadata** (extract date, attendees, duration if mentioned)
+
+Format the response in clean markdown for easy conversion to Word document.
+"""
+
+# llama.cpp's llama-server exposes an OpenAI-compatible API
+LLAMACPP_BASE_URL = os.environ.get("LLAMACPP_BASE_URL", "http://localhost:8080/v1")
+LLAMACPP_MODEL = os.environ.get("LLAMACPP_MODEL", "llama3.1")
+# Roughly 2k tokens per chunk when splitting long transcripts
+LLAMACPP_CHUNK_CHARS = 8000
+
 class MeetingAnalyzer:
-    def __init__(self, model_type="local"):
+    def __init__(self, model_type="local", llamacpp_url=LLAMACPP_BASE_URL, llamacpp_parallel=4):
         self.model_type = model_type
+        self.llamacpp_parallel = llamacpp_parallel
+        self._action_automaton = self._build_action_automaton() if AHOCORASICK_AVAILABLE else None
+        self._local_stats_cache = OrderedDict()
         
         if model_type == "ollama" and OLLAMA_AVAILABLE:
             self.client = ollama
+            self._async_client_factory = ollama.AsyncClient
             print("✓ Using Ollama for local AI processing")
         elif model_type == "openai" and OPENAI_AVAILABLE:
             self.client = openai.OpenAI()
+            self._async_client_factory = openai.AsyncOpenAI
             print("✓ Using OpenAI for analysis")
+        elif model_type == "llamacpp" and OPENAI_AVAILABLE:
+            self._async_client_factory = lambda: openai.AsyncOpenAI(
+                base_url=llamacpp_url, api_key="sk-no-key-required"
+            )
+            print(f"✓ Using llama.cpp server at {llamacpp_url}")
         else:
             self.model_type = "local"
             print("✓ Using local text processing (no AI)")
@@ -53,9 +143,134 @@ class MeetingAnalyzer:
             return self._analyze_with_ollama(text)
         elif self.model_type == "openai":
             return self._analyze_with_openai(text)
+        elif self.model_type == "llamacpp":
+            return self._run_async(self._analyze_with_llamacpp, text)
         else:
             return self._analyze_with_local_processing(text)
     
+    def analyze_many(self, texts):
+        """Analyze several meeting notes, dispatching AI requests concurrently"""
+        if self.model_type == "ollama":
+            return self._run_async(self._analyze_with_ollama_batch, texts)
+        elif self.model_type == "openai":
+            return self._run_async(self._analyze_with_openai_batch, texts)
+        elif self.model_type == "llamacpp":
+            return self._run_async(self._analyze_with_llamacpp_batch, texts)
+        else:
+            return [self._analyze_with_local_processing(text) for text in texts]
+    
+    def _run_async(self, analyze, *args):
+        """Run analyze(client, *args) in a new event loop with an async client made for it"""
+        async def run():
+            # httpx connection pools are bound to the loop that first used them, so a
+            # client kept across asyncio.run() calls fails once its first loop is closed
+            client = self._async_client_factory()
+            try:
+                return await analyze(client, *args)
+            finally:
+                close = getattr(client, "close", None)
+                if close is not None:
+                    await close()
+        return asyncio.run(run())
+    
+    async def _analyze_with_ollama_batch(self, client, texts):
+        """Use Ollama's async client to analyze all texts concurrently"""
+        prompts = [self._create_analysis_prompt(text) for text in texts]
+        responses = await asyncio.gather(
+            *[client.chat(model='llama3.1', messages=[{'role': 'user', 'content': p}])
+              for p in prompts],
+            return_exceptions=True
+        )
+        
+        results = []
+        for text, response in zip(texts, responses):
+            if isinstance(response, Exception):
+                print(f"Ollama error: {response}")
+                results.append(self._analyze_with_local_processing(text))
+            else:
+                results.append(response['message']['content'])
+        return results
+    
+    async def _analyze_with_openai_batch(self, client, texts):
+        """Use OpenAI's async client to analyze all texts concurrently"""
+        prompts = [self._create_analysis_prompt(text) for text in texts]
+        responses = await asyncio.gather(
+            *[client.chat.completions.create(
+                model="gpt-4",
+                messages=[
+                    {"role": "system", "content": "You are an expert meeting analyst."},
+                    {"role": "user", "content": p}
+                ],
+                temperature=0.3
+            ) for p in prompts],
+            return_exceptions=True
+        )
+        
+        results = []
+        for text, response in zip(texts, responses):
+            if isinstance(response, Exception):
+                print(f"OpenAI error: {response}")
+                results.append(self._analyze_with_local_processing(text))
+            else:
+                results.append(response.choices[0].message.content)
+        return results
+    
+    async def _analyze_with_llamacpp_batch(self, client, texts):
+        """Use llama.cpp to analyze all texts concurrently"""
+        slots = asyncio.Semaphore(self.llamacpp_parallel)
+        return await asyncio.gather(*[self._analyze_with_llamacpp(client, text, slots) for text in texts])
+    
+    async def _analyze_with_llamacpp(self, client, text, slots=None):
+        """Use llama.cpp, map-reducing transcripts that are too long for one prompt"""
+        if slots is None:
+            slots = asyncio.Semaphore(self.llamacpp_parallel)
+        
+        try:
+            chunks = self._split_transcript(text)
+            if len(chunks) == 1:
+                return await self._llamacpp_complete(client, self._create_analysis_prompt(text), slots)
+            
+            # Map: analyze each chunk concurrently, then reduce the partial analyses
+            partials = await asyncio.gather(
+                *[self._llamacpp_complete(client, self._create_analysis_prompt(chunk), slots)
+                  for chunk in chunks]
+            )
+            return await self._llamacpp_complete(client, self._create_merge_prompt(partials), slots)
+        except Exception as e:
+            print(f"llama.cpp error: {e}")
+            return self._analyze_with_local_processing(text)
+    
+    async def _llamacpp_complete(self, client, prompt, slots):
+        """Send one prompt to llama-server, limited to the configured parallel slots"""
+        async with slots:
+            response = await client.chat.completions.create(
+                model=LLAMACPP_MODEL,
+                messages=[
+                    {"role": "system", "content": "You are an expert meeting analyst."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.3
+            )
+        return response.choices[0].message.content
+    
+    def _split_transcript(self, text, max_chars=LLAMACPP_CHUNK_CHARS):
+        """Split text on blank lines into chunks of at most max_chars"""
+        chunks = []
+        current = []
+        current_len = 0
+        
+        for paragraph in text.split('\n\n'):
+            if current and current_len + len(paragraph) > max_chars:
+                chunks.append('\n\n'.join(current))
+                current = []
+                current_len = 0
+            current.append(paragraph)
+            current_len += len(paragraph) + 2
+        
+        if current:
+            chunks.append('\n\n'.join(current))
+        return chunks
+    
     def _analyze_with_ollama(self, text):
         """Use Ollama for AI analysis"""
         prompt = self._create_analysis_prompt(text)
@@ -92,51 +307,30 @@ class MeetingAnalyzer:
         """Fallback local text processing without AI"""
         print("Using local text processing...")
         
-        # Extract basic information
-        lines = text.split('\n')
-        word_count = len(text.split())
-        
-        # Simple keyword extraction for action items
-        action_keywords = ['action', 'todo', 'task', 'assign', 'responsible', 'deadline', 'due']
-        action_lines = []
-        
-        for line in lines:
-            if any(keyword in line.lower() for keyword in action_keywords):
-                action_lines.append(line.strip())
-        
-        # Extract names (simple capitalized words)
-        names = set()
-        for word in text.split():
-            if word.istitle() and len(word) > 2:
-                names.add(word)
-        
-        # Extract dates (simple pattern)
-        date_pattern = r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b'
-        dates = re.findall(date_pattern, text)
+        word_count, line_count, names, action_lines, dates = self._compute_local_stats(text)
         
         # Generate summary
-        summary = f"""
+        parts = [f"""
 # Meeting Summary Report
 
 **Generated on:** {datetime.now().strftime('%Y-%m-%d %H:%M')}
 **Word Count:** {word_count} words
 
 ## Executive Summary
-This meeting covered {len(lines)} discussion points with {len(action_lines)} potential action items identified.
+This meeting covered {line_count} discussion points with {len(action_lines)} potential action items identified.
 
 ## Key Participants
 {', '.join(list(names)[:10]) if names else 'Names not clearly identified'}
 
 ## Potential Action Items
-"""
+"""]
         
-        for i, action in enumerate(action_lines[:10], 1):
-            summary += f"{i}. {action}\n"
+        parts.extend(f"{i}. {action}\n" for i, action in enumerate(action_lines[:10], 1))
         
         if not action_lines:
-            summary += "No clear action items detected in the text.\n"
+            parts.append("No clear action items detected in the text.\n")
         
-        summary += f"""
+        parts.append(f"""
 ## Important Dates Mentioned
 {', '.join(dates) if dates else 'No specific dates found'}
 
@@ -147,29 +341,66 @@ This meeting covered {len(lines)} discussion points with {len(action_lines)} pot
 
 ## Note
 This summary was generated using local text processing. For better AI-powered analysis, install Ollama or configure OpenAI API.
-"""
+""")
         
-        return summary
+        return ''.join(parts)
     
-    def _create_analysis_prompt(self, text):
-        return f"""
-        Analyze the following meeting notes and provide a comprehensive summary:
+    def _compute_local_stats(self, text):
+        """Extract counts, names, action items and dates, memoized by a hash of the text"""
+        key = hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+        stats = self._local_stats_cache.get(key)
+        if stats is not None:
+            self._local_stats_cache.move_to_end(key)
+            return stats
+        
+        # Extract basic information
+        line_count = text.count('\n') + 1
+        word_count = sum(1 for _ in _TOKEN_RE.finditer(text))
         
-        **Meeting Notes:**
-        {text}
+        # Extract names (simple capitalized words)
+        names = frozenset(_NAME_RE.findall(text))
+        
+        # Simple keyword extraction for action items
+        lines = text.split('\n')
+        if self._action_automaton is not None:
+            action_lines = self._find_action_lines(text, lines)
+        else:
+            action_lines = []
+            for line in lines:
+                if any(keyword in line.lower() for keyword in ACTION_KEYWORDS):
+                    action_lines.append(line.strip())
         
-        **Please provide:**
+        # Extract dates (simple pattern)
+        dates = _DATE_RE.findall(text)
         
-        1. **Executive Summary** (2-3 sentences)
-        2. **Key Discussion Points** (bullet points)
-        3. **Action Items** (format: Task | Assignee | Due Date | Priority)
-        4. **Decisions Made** (clear decisions reached)
-        5. **Risks/Concerns** (if any mentioned)
-        6. **Next Steps** (immediate follow-ups)
-        7. **Meeting Metadata** (extract date, attendees, duration if mentioned)
+        stats = (word_count, line_count, names, tuple(action_lines), tuple(dates))
+        self._local_stats_cache[key] = stats
+        if len(self._local_stats_cache) > LOCAL_STATS_CACHE_SIZE:
+            self._local_stats_cache.popitem(last=False)
+        return stats
+    
+    def _build_action_automaton(self):
+        """Build an Aho-Corasick automaton over the action keywords"""
+        automaton = ahocorasick.Automaton()
+        for keyword in ACTION_KEYWORDS:
+            automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+        return automaton
+    
+    def _find_action_lines(self, text, lines):
+        """Find lines containing an action keyword with a single automaton pass"""
+        text_lower = text.lower()
+        # Start offset of each line in the lowercased text
+        line_starts = list(accumulate((len(line) + 1 for line in text_lower.split('\n')), initial=0))
         
-        Format the response in clean markdown for easy conversion to Word document.
-        """
+        hit_lines = sorted({bisect_right(line_starts, end) - 1 for end, _ in self._action_automaton.iter(text_lower)})
+        return [lines[i].strip() for i in hit_lines]
+    
+    def _create_analysis_prompt(self, text):
+        return _PROMPT_PREFIX + text + _PROMPT_SUFFIX
+    
+    def _create_merge_prompt(self, partial_analyses):
+        return _MERGE_PROMPT_PREFIX + "\n\n---\n\n".join(partial_analyses) + _PROMPT_SUFFIX
     
     def generate_word_document(self, analysis_text, meeting_title="Meeting Summary"):
         """Convert analysis to Word document"""
@@ -186,32 +417,11 @@ This summary was generated using local text processing. For better AI-powered an
         doc.add_paragraph(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
         doc.add_paragraph("=" * 50)
         
-        # Process and add content
-        lines = analysis_text.split('\n')
-        
-        for line in lines:
+        # Process and add content, dispatching on each line's kind
+        for line in analysis_text.split('\n'):
             line = line.strip()
-            if line.startswith('**') and line.endswith('**'):
-                # This is a heading
-                heading_text = line.replace('**', '')
-                doc.add_heading(heading_text, level=1)
-            elif line.startswith('# '):
-                # Markdown heading
-                heading_text = line.replace('# ', '')
-                doc.add_heading(heading_text, level=1)
-            elif line.startswith('## '):
-                # Markdown subheading
-                heading_text = line.replace('## ', '')
-                doc.add_heading(heading_text, level=2)
-            elif line.startswith('- ') or line.startswith('* '):
-                # This is a bullet point
-                doc.add_paragraph(line[2:], style='List Bullet')
-            elif re.match(r'^\d+\.\s', line):
-                # Numbered list
-                doc.add_paragraph(line, style='List Number')
-            elif line and not line.startswith('#'):
-                # Regular paragraph
-                doc.add_paragraph(line)
+            match = _LINE_KIND_RE.match(line)
+            _LINE_HANDLERS[match.lastgroup if match else 'paragraph'](doc, line)
         
         return doc
     
@@ -222,23 +432,56 @@ This summary was generated using local text processing. For better AI-powered an
                 self.content = f"{title}\n{'='*len(title)}\n\n{content}"
             
             def save(self, filename):
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(self.content)
+                Path(filename).write_text(self.content, encoding='utf-8')
         
         return TextDoc(analysis_text, meeting_title)
 
+def save_summary(analyzer, analysis, output_path, title="Meeting Summary"):
+    """Save an analysis as a Word document, or as text for any other extension"""
+    if output_path.lower().endswith('.docx'):
+        doc = analyzer.generate_word_document(analysis, title)
+    else:
+        # Markdown/text output doesn't need a Word document built first
+        doc = analyzer._save_as_text(analysis, title)
+    doc.save(output_path)
+
+def analyze_files(args, model_choice):
+    """Analyze several meeting note files in one analyze_many call, saving one summary each"""
+    texts = [Path(f).read_text(encoding='utf-8', errors='replace') for f in args.input_files]
+    
+    output_dir = Path(args.output or ".")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    extension = ".docx" if DOCX_AVAILABLE else ".txt"
+    
+    analyzer = MeetingAnalyzer(model_type=model_choice, llamacpp_url=args.llamacpp_url,
+                               llamacpp_parallel=args.parallel)
+    
+    print(f"\n🔍 Analyzing {len(texts)} meeting notes...")
+    analyses = analyzer.analyze_many(texts)
+    
+    for input_file, analysis in zip(args.input_files, analyses):
+        output_path = str(output_dir / f"{Path(input_file).stem}_summary{extension}")
+        save_summary(analyzer, analysis, output_path, f"Meeting Summary - {Path(input_file).stem}")
+        print(f"✅ Meeting summary saved to: {output_path}")
+
 def main():
     parser = argparse.ArgumentParser(description="Analyze meeting notes with AI")
-    parser.add_argument("input_file", nargs='?', help="Path to meeting notes text file")
-    parser.add_argument("-o", "--output", help="Output document path")
-    parser.add_argument("-m", "--model", choices=["local", "ollama", "openai"], 
+    parser.add_argument("input_files", nargs='*', metavar="input_file",
+                       help="Path to meeting notes text file; several files are analyzed concurrently")
+    parser.add_argument("-o", "--output",
+                       help="Output document path (a directory when several input files are given)")
+    parser.add_argument("-m", "--model", choices=["local", "ollama", "openai", "llamacpp"], 
                        default="local", help="AI model to use")
+    parser.add_argument("--llamacpp-url", default=LLAMACPP_BASE_URL,
+                       help="Base URL of the llama.cpp server's OpenAI-compatible API")
+    parser.add_argument("--parallel", type=int, default=4,
+                       help="Concurrent requests to the llama.cpp server (match its --parallel)")
     parser.add_argument("--interactive", action="store_true", help="Interactive mode")
     
     args = parser.parse_args()
     
     # Interactive mode
-    if args.interactive or not args.input_file:
+    if args.interactive or not args.input_files:
         print("\n🤖 Meeting Notes AI Analyzer")
         print("=" * 40)
         
@@ -249,8 +492,7 @@ def main():
             if choice == "1":
                 file_path = input("Enter path to meeting notes file: ").strip()
                 if os.path.exists(file_path):
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        meeting_text = f.read()
+                    meeting_text = Path(file_path).read_text(encoding='utf-8', errors='replace')
                     break
                 else:
                     print("File not found. Please try again.")
@@ -270,25 +512,30 @@ def main():
             print(f"- ollama (AI-powered)")
         if OPENAI_AVAILABLE:
             print(f"- openai (requires API key)")
+            print(f"- llamacpp (local llama-server)")
         
         model_choice = input(f"Choose model ({args.model}): ").strip() or args.model
         
     else:
         # File mode
-        if not os.path.exists(args.input_file):
-            print(f"Error: File '{args.input_file}' not found")
-            return
+        for input_file in args.input_files:
+            if not os.path.exists(input_file):
+                print(f"Error: File '{input_file}' not found")
+                return
         
-        with open(args.input_file, 'r', encoding='utf-8') as f:
-            meeting_text = f.read()
         model_choice = args.model
+        if len(args.input_files) > 1:
+            analyze_files(args, model_choice)
+            return
+        meeting_text = Path(args.input_files[0]).read_text(encoding='utf-8', errors='replace')
     
     if not meeting_text.strip():
         print("Error: No meeting notes provided")
         return
     
     # Initialize analyzer
-    analyzer = MeetingAnalyzer(model_type=model_choice)
+    analyzer = MeetingAnalyzer(model_type=model_choice, llamacpp_url=args.llamacpp_url,
+                               llamacpp_parallel=args.parallel)
     
     print("\n🔍 Analyzing meeting notes...")
     analysis = analyzer.analyze_meeting_notes(meeting_text)
@@ -304,8 +551,7 @@ def main():
             output_path = f"meeting_summary_{timestamp}.txt"
     
     print("📄 Generating document...")
-    doc = analyzer.generate_word_document(analysis)
-    doc.save(output_path)
+    save_summary(analyzer, analysis, output_path)
     
     print(f"✅ Meeting summary saved to: {output_path}")
     
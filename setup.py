@@ -165,12 +165,20 @@ def test_installation():
     
     return all_good
 
+def detect_compute_type():
+    """Pick the faster-whisper compute type: int8_float16 needs a CUDA GPU, int8 runs anywhere."""
+    try:
+        import ctranslate2
+        return "int8_float16" if ctranslate2.get_cuda_device_count() > 0 else "int8"
+    except ImportError:
+        return "int8"
+
 def create_sample_files():
     """Create sample configuration and usage files."""
     print("\nCreating sample files...")
     
     # Create a sample configuration file
-    config_content = """# Audio to Text Converter Configuration
+    config_content = f"""# Audio to Text Converter Configuration
 # You can modify these settings as needed
 
 [DEFAULT]
@@ -187,6 +195,8 @@ output_format = txt
 # OpenAI Whisper settings
 model = base
 # Available models: tiny, base, small, medium, large
+# faster-whisper compute type: int8_float16 (GPU), int8 (CPU), float16, float32
+compute_type = {detect_compute_type()}
 """
     
     config_path = Path(__file__).parent / "config.ini"
@@ -220,6 +230,54 @@ Use Whisper for offline transcription:
 python audio_to_text_cli.py --input "audio.wav" --engine whisper
 ```
 
+## Quantized whisper.cpp Model (CPU, no GPU)
+The simple web converter can run a quantized whisper.cpp model. One-time setup:
+```
+pip install pywhispercpp
+git clone https://github.com/ggerganov/whisper.cpp
+cd whisper.cpp
+sh ./models/download-ggml-model.sh base.en
+cmake -B build && cmake --build build --config Release
+./build/bin/quantize models/ggml-base.en.bin models/ggml-base.en-q5_0.bin q5_0
+```
+Then start the server with:
+```
+WHISPER_BACKEND=whispercpp WHISPERCPP_MODEL=whisper.cpp/models/ggml-base.en-q5_0.bin python simple_web_converter.py
+```
+
+## Pre-quantized Whisper Model (CPU)
+The web converter runs faster-whisper with int8 weights on CPU by default.
+To skip the conversion at load time, convert the model once:
+```
+pip install transformers
+ct2-transformers-converter --model openai/whisper-base --output_dir models/whisper-base-int8 --quantization int8
+```
+Then start the server with:
+```
+WHISPER_MODEL=models/whisper-base-int8 python web_converter.py
+```
+
+## ONNX Runtime Whisper Model (CPU)
+The working converter can run Whisper on ONNX Runtime with int8 weights. One-time export:
+```
+pip install optimum[onnxruntime]
+optimum-cli export onnx --model openai/whisper-base --no-post-process whisper_base_onnx/
+optimum-cli onnxruntime quantize --onnx_model whisper_base_onnx/ --avx512_vnni -o whisper_base_onnx/
+```
+Use `--avx2` instead of `--avx512_vnni` on CPUs without VNNI. Then start the server with:
+```
+WHISPER_BACKEND=onnx WHISPER_ONNX_MODEL=whisper_base_onnx python working_converter.py
+```
+
+## Transcript Cache (web_converter.py)
+Repeat uploads of the same audio reuse their transcript from an in-memory cache
+(RESULT_CACHE_SIZE entries, default 256). Nothing is written to disk unless you opt in:
+```
+TRANSCRIPT_CACHE_DIR=~/.cache/auto_to_text/transcripts TRANSCRIPT_CACHE_FILES=1000 python web_converter.py
+```
+The directory then keeps at most TRANSCRIPT_CACHE_FILES transcripts (least recently used are
+deleted first). Delete the directory to clear it.
+
 ## Supported Audio Formats
 - MP3, WAV, FLAC, M4A, OGG, AAC, WMA
 
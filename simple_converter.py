@@ -7,6 +7,11 @@ import os
 import sys
 import json
 import logging
+import configparser
+import shutil
+import subprocess
+import wave
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 
@@ -14,12 +19,24 @@ from typing import Optional, List, Dict, Any
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+CONFIG_PATH = Path(__file__).parent / "config.ini"
+
+# Format produced by _decode_audio: 16 kHz mono signed 16-bit little-endian PCM
+PCM_SAMPLE_RATE = 16000
+PCM_SAMPLE_WIDTH = 2
+
+def _read_compute_type() -> Optional[str]:
+    """Read the faster-whisper compute type from config.ini, or None to pick one per device."""
+    config = configparser.ConfigParser()
+    config.read(CONFIG_PATH)
+    return config.get("WHISPER", "compute_type", fallback=None)
+
 class SimpleAudioToTextConverter:
     """
     A simplified audio-to-text converter that handles missing dependencies gracefully.
     """
     
-    def __init__(self):
+    def __init__(self, device: Optional[str] = None, compute_type: Optional[str] = None):
         self.supported_formats = {
             '.mp3', '.wav', '.flac', '.m4a', '.ogg', 
             '.aac', '.wma', '.aiff', '.au', '.3gp'
@@ -27,9 +44,19 @@ class SimpleAudioToTextConverter:
         self.speech_recognition = None
         self.pydub = None
         self.whisper = None
+        self.faster_whisper = None
+        self.ffmpeg = shutil.which("ffmpeg")
+        self.device = device
+        self.compute_type = compute_type or _read_compute_type()
+        self._whisper_models = {}
+        self._batched_pipelines = {}
         
         # Try to import dependencies
         self._import_dependencies()
+        
+        # Optionally load the default model up front
+        if self.whisper is not None and os.environ.get("WHISPER_PRELOAD") == "1":
+            self.warmup()
     
     def _import_dependencies(self):
         """Import available dependencies."""
@@ -54,6 +81,13 @@ class SimpleAudioToTextConverter:
             logger.info("Whisper available")
         except ImportError as e:
             logger.info(f"Whisper not available: {e}")
+        
+        try:
+            import faster_whisper
+            self.faster_whisper = faster_whisper
+            logger.info("faster-whisper available")
+        except ImportError as e:
+            logger.info(f"faster-whisper not available: {e}")
     
     def is_supported_format(self, file_path: str) -> bool:
         """Check if the audio file format is supported."""
@@ -61,31 +95,54 @@ class SimpleAudioToTextConverter:
     
     def convert_to_wav(self, input_path: str, output_path: str = None) -> str:
         """Convert audio file to WAV format."""
-        if self.pydub is None:
-            raise ImportError("PyDub is required for audio format conversion")
+        if self.ffmpeg is None and self.pydub is None:
+            raise ImportError("FFmpeg or PyDub is required for audio format conversion")
         
         if output_path is None:
             output_path = str(Path(input_path).with_suffix('.wav'))
         
         try:
-            audio = self.pydub.from_file(input_path)
-            audio = audio.set_channels(1).set_frame_rate(16000)
-            audio.export(output_path, format="wav")
+            if self.ffmpeg is not None:
+                # ffmpeg already downmixes and resamples to the fixed target format
+                with wave.open(output_path, 'wb') as wav_file:
+                    wav_file.setnchannels(1)
+                    wav_file.setsampwidth(PCM_SAMPLE_WIDTH)
+                    wav_file.setframerate(PCM_SAMPLE_RATE)
+                    wav_file.writeframes(self._decode_audio(input_path))
+            else:
+                audio = self.pydub.from_file(input_path)
+                audio = audio.set_channels(1).set_frame_rate(PCM_SAMPLE_RATE)
+                audio.export(output_path, format="wav")
             logger.info(f"Converted {input_path} to {output_path}")
             return output_path
         except Exception as e:
             logger.error(f"Error converting {input_path} to WAV: {str(e)}")
             raise
     
-    def transcribe_with_google(self, audio_path: str, language: str = "en-US") -> str:
-        """Transcribe audio using Google Speech Recognition."""
+    def _decode_audio(self, input_path: str) -> bytes:
+        """Decode an audio file to 16 kHz mono 16-bit PCM through an ffmpeg pipe."""
+        if self.ffmpeg is None:
+            raise RuntimeError("FFmpeg is required for audio decoding")
+        
+        proc = subprocess.run(
+            [self.ffmpeg, "-nostdin", "-i", input_path,
+             "-f", "s16le", "-ac", "1", "-ar", str(PCM_SAMPLE_RATE), "-"],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True
+        )
+        return proc.stdout
+    
+    def transcribe_with_google(self, audio, language: str = "en-US") -> str:
+        """Transcribe audio (a WAV path or decoded PCM bytes) using Google Speech Recognition."""
         if self.speech_recognition is None:
             raise ImportError("SpeechRecognition is required for Google transcription")
         
         try:
-            with self.speech_recognition.AudioFile(audio_path) as source:
-                self.recognizer.adjust_for_ambient_noise(source)
-                audio_data = self.recognizer.record(source)
+            if isinstance(audio, bytes):
+                audio_data = self.speech_recognition.AudioData(audio, PCM_SAMPLE_RATE, PCM_SAMPLE_WIDTH)
+            else:
+                with self.speech_recognition.AudioFile(audio) as source:
+                    self.recognizer.adjust_for_ambient_noise(source)
+                    audio_data = self.recognizer.record(source)
             
             text = self.recognizer.recognize_google(audio_data, language=language)
             logger.info("Google Speech Recognition completed successfully")
@@ -101,20 +158,123 @@ class SimpleAudioToTextConverter:
             logger.error(f"Error in Google transcription: {str(e)}")
             return f"Error: {str(e)}"
     
-    def transcribe_with_whisper(self, audio_path: str, model_name: str = "base") -> str:
-        """Transcribe audio using OpenAI Whisper."""
+    def _get_whisper_model(self, model_name: str):
+        """Return a loaded Whisper model, loading it on first use."""
+        model = self._whisper_models.get(model_name)
+        if model is None:
+            model = self.whisper.load_model(model_name, device=self.device)
+            self._whisper_models[model_name] = model
+            logger.info(f"Whisper model '{model_name}' loaded")
+        return model
+    
+    def warmup(self, model_name: str = "base"):
+        """Preload a Whisper model so the first transcription doesn't pay for it."""
+        if self.whisper is None:
+            raise ImportError("Whisper is required for offline transcription")
+        self._get_whisper_model(model_name)
+    
+    def transcribe_with_whisper(self, audio, model_name: str = "base") -> str:
+        """Transcribe audio (a file path or decoded PCM bytes) using OpenAI Whisper."""
         if self.whisper is None:
             raise ImportError("Whisper is required for offline transcription")
         
         try:
-            model = self.whisper.load_model(model_name)
-            result = model.transcribe(audio_path)
+            model = self._get_whisper_model(model_name)
+            if isinstance(audio, bytes):
+                import numpy as np
+                audio = np.frombuffer(audio, dtype=np.int16).astype(np.float32) / 32768.0
+            result = model.transcribe(audio)
             logger.info("Whisper transcription completed successfully")
             return result["text"].strip()
         except Exception as e:
             logger.error(f"Error in Whisper transcription: {str(e)}")
             return f"Error: {str(e)}"
     
+    def _get_batched_pipeline(self, model_name: str):
+        """Return a faster-whisper batched pipeline, loading the model on first use."""
+        pipeline = self._batched_pipelines.get(model_name)
+        if pipeline is None:
+            import ctranslate2
+            device = self.device or ("cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu")
+            compute_type = self.compute_type or ("int8_float16" if device == "cuda" else "int8")
+            if device == "cpu" and compute_type in ("float16", "int8_float16"):
+                # CTranslate2 has no float16 kernels on CPU and raises instead of falling back
+                logger.warning(f"compute_type '{compute_type}' needs a GPU; using int8 on CPU")
+                compute_type = "int8"
+            model = self.faster_whisper.WhisperModel(
+                model_name, device=device, compute_type=compute_type
+            )
+            pipeline = self.faster_whisper.BatchedInferencePipeline(model=model)
+            self._batched_pipelines[model_name] = pipeline
+            logger.info(f"faster-whisper model '{model_name}' loaded on {device} ({compute_type})")
+        return pipeline
+    
+    def transcribe_files(self, paths: List[str], engine: str = "google", language: str = "en-US",
+                         max_workers: Optional[int] = None, model_name: str = "base",
+                         batch_size: int = 8) -> List[Dict[str, Any]]:
+        """Transcribe several files, overlapping decoding and network calls across files."""
+        paths = list(paths)
+        
+        if engine.lower() == "whisper":
+            if self.faster_whisper is not None:
+                return self._transcribe_files_batched(paths, model_name, batch_size)
+            # One shared model gains nothing from concurrent calls, so run serially
+            return [self.transcribe_file(path, engine, language) for path in paths]
+        
+        if not paths:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=max_workers or min(8, len(paths))) as executor:
+            return list(executor.map(lambda path: self.transcribe_file(path, engine, language), paths))
+    
+    def _transcribe_files_batched(self, paths: List[str], model_name: str = "base",
+                                  batch_size: int = 8) -> List[Dict[str, Any]]:
+        """Transcribe several files with faster-whisper's batched pipeline."""
+        # A model that fails to load fails each file instead of the whole call
+        try:
+            pipeline = self._get_batched_pipeline(model_name)
+            load_error = None
+        except Exception as e:
+            pipeline = None
+            load_error = f"Could not load faster-whisper model '{model_name}': {e}"
+            logger.error(load_error)
+        results = []
+        
+        for input_path in paths:
+            result = {
+                "file_path": input_path,
+                "engine": "whisper",
+                "language": None,
+                "text": "",
+                "success": False,
+                "error": None
+            }
+            
+            try:
+                if pipeline is None:
+                    raise RuntimeError(load_error)
+                
+                if not os.path.exists(input_path):
+                    raise FileNotFoundError(f"File not found: {input_path}")
+                
+                if not self.is_supported_format(input_path):
+                    raise ValueError(f"Unsupported audio format: {Path(input_path).suffix}")
+                
+                # faster-whisper decodes any format itself, so no WAV conversion is needed
+                segments, info = pipeline.transcribe(input_path, batch_size=batch_size)
+                result["text"] = "".join(segment.text for segment in segments).strip()
+                result["language"] = info.language
+                result["success"] = True
+                logger.info(f"Successfully transcribed {input_path}")
+                
+            except Exception as e:
+                result["error"] = str(e)
+                logger.error(f"Error transcribing {input_path}: {str(e)}")
+            
+            results.append(result)
+        
+        return results
+    
     def transcribe_file(self, input_path: str, engine: str = "google", 
                        language: str = "en-US") -> Dict[str, Any]:
         """Main method to transcribe an audio file."""
@@ -135,30 +295,20 @@ class SimpleAudioToTextConverter:
             if not self.is_supported_format(input_path):
                 raise ValueError(f"Unsupported audio format: {Path(input_path).suffix}")
             
-            # Convert to WAV if necessary
-            wav_path = input_path
-            temp_wav = False
-            
-            if Path(input_path).suffix.lower() != '.wav':
-                if self.pydub is None:
-                    result["error"] = "PyDub is required for format conversion. Please install it or use WAV files."
-                    return result
-                
-                wav_path = self.convert_to_wav(input_path)
-                temp_wav = True
+            # Decode to 16 kHz mono PCM in memory; WAV files can be read directly without ffmpeg
+            if self.ffmpeg is not None:
+                audio = self._decode_audio(input_path)
+            elif Path(input_path).suffix.lower() == '.wav':
+                audio = input_path
+            else:
+                result["error"] = "FFmpeg is required for format conversion. Please install it or use WAV files."
+                return result
             
             # Transcribe based on selected engine
             if engine.lower() == "whisper":
-                result["text"] = self.transcribe_with_whisper(wav_path)
+                result["text"] = self.transcribe_with_whisper(audio)
             else:  # Default to Google
-                result["text"] = self.transcribe_with_google(wav_path, language)
-            
-            # Clean up temporary WAV file
-            if temp_wav and os.path.exists(wav_path):
-                try:
-                    os.remove(wav_path)
-                except:
-                    pass
+                result["text"] = self.transcribe_with_google(audio, language)
             
             result["success"] = True
             logger.info(f"Successfully transcribed {input_path}")
@@ -183,7 +333,9 @@ class SimpleAudioToTextConverter:
         return {
             "speech_recognition": self.speech_recognition is not None,
             "pydub": self.pydub is not None,
-            "whisper": self.whisper is not None
+            "whisper": self.whisper is not None,
+            "faster_whisper": self.faster_whisper is not None,
+            "ffmpeg": self.ffmpeg is not None
         }
 
 def main():
@@ -207,7 +359,7 @@ def main():
         print("Please install dependencies:")
         print("  - For Google: pip install speechrecognition")
         print("  - For Whisper: pip install openai-whisper")
-        print("  - For format conversion: pip install pydub")
+        print("  - For format conversion: install FFmpeg (https://ffmpeg.org)")
         return
     
     # Example usage
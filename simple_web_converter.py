@@ -4,585 +4,640 @@ Uses only Whisper for background processing to avoid compatibility issues.
 """
 
 import http.server
-import socketserver
+import gzip
+import hashlib
+import importlib.util
 import json
 import os
 import tempfile
 import threading
+import queue
 import webbrowser
 import time
 import uuid
 import shutil
-import base64
+from collections import deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse, parse_qs
+from enum import Enum
 from pathlib import Path
 
+# Optional fast JSON encoder; falls back to the standard library
+try:
+    import orjson
+    
+    def encode_json(obj):
+        return orjson.dumps(obj)
+except ImportError:
+    def encode_json(obj):
+        return json.dumps(obj).encode()
+
+# Optional page minifier and brotli compression for the served HTML
+try:
+    import htmlmin
+    HTMLMIN_AVAILABLE = True
+except ImportError:
+    HTMLMIN_AVAILABLE = False
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# Optional in-process audio decoding (skips Whisper's ffmpeg subprocess)
+try:
+    import numpy as np
+    import soundfile as sf
+    SOUNDFILE_AVAILABLE = True
+except ImportError:
+    SOUNDFILE_AVAILABLE = False
+
+try:
+    import librosa
+    LIBROSA_AVAILABLE = True
+except ImportError:
+    LIBROSA_AVAILABLE = False
+
+STATIC_INDEX = Path(__file__).resolve().parent / "static" / "index.html"
+
+def minify_html(html):
+    """
+    Minify the page with htmlmin when installed.
+    
+    The fallback only strips indentation and blank lines, which is safe for
+    the inline CSS and JS because no string or template literal spans lines.
+    """
+    if HTMLMIN_AVAILABLE:
+        return htmlmin.minify(html, remove_comments=True, remove_empty_space=True)
+    return "\n".join(line.strip() for line in html.splitlines() if line.strip())
+
+
+JOB_NOT_FOUND = encode_json({'status': 'error', 'error': 'Job not found'})
+
+# openai-whisper micro-batching: up to this many 30 s windows share one encoder pass
+WHISPER_BATCH_SIZE = int(os.environ.get("WHISPER_BATCH_SIZE", "8"))
+# How long the batch worker waits for more jobs before running a batch
+BATCH_WAIT_SECONDS = 0.1
+
+
+class WhisperBackend(Enum):
+    """Whisper inference backends, selectable with the WHISPER_BACKEND env var."""
+    OPENAI = "openai"
+    FASTER = "faster"
+    TRTLLM = "trtllm"
+    WHISPERCPP = "whispercpp"
+
+
+class TrtLlmWhisperModel:
+    """
+    Thin adapter around a prebuilt TensorRT-LLM Whisper engine that exposes the
+    openai-whisper ``transcribe(path) -> {"text": ...}`` interface.
+    
+    Build the engine with the TensorRT-LLM whisper example, e.g.
+    ``python3 build.py --output_dir whisper_base --use_gpt_attention_plugin --use_gemm_plugin``,
+    and point TRTLLM_ENGINE_DIR at the output directory. openai-whisper is still
+    used for audio loading, log-mel features and the tokenizer.
+    """
+    
+    def __init__(self, engine_dir, whisper_module, max_new_tokens=96):
+        import torch
+        from tensorrt_llm.runtime import ModelRunnerCpp
+        
+        self.torch = torch
+        self.whisper = whisper_module
+        self.max_new_tokens = max_new_tokens
+        
+        with open(os.path.join(engine_dir, "encoder", "config.json")) as f:
+            self.n_mels = json.load(f)["pretrained_config"]["n_mels"]
+        
+        self.runner = ModelRunnerCpp.from_dir(
+            engine_dir=engine_dir,
+            is_enc_dec=True,
+            max_batch_size=1,
+            max_input_len=3000,
+            max_output_len=max_new_tokens,
+            max_beam_width=1
+        )
+        # No fixed language: transcribe() asks the model for it on the first window
+        self.tokenizer = whisper_module.tokenizer.get_tokenizer(
+            multilingual=True, language=None, task="transcribe"
+        )
+    
+    def _generate(self, mel, prompt, max_new_tokens):
+        """Run the engine on one log-mel window and return prompt plus generated token ids."""
+        torch = self.torch
+        outputs = self.runner.generate(
+            batch_input_ids=[torch.tensor(prompt, dtype=torch.int32)],
+            encoder_input_features=[mel.transpose(0, 1)],
+            encoder_output_lengths=torch.tensor([mel.shape[1] // 2], dtype=torch.int32),
+            max_new_tokens=max_new_tokens,
+            end_id=self.tokenizer.eot,
+            pad_id=self.tokenizer.eot,
+            num_beams=1,
+            output_sequence_lengths=True,
+            return_dict=True
+        )
+        length = int(outputs["sequence_lengths"][0][0])
+        return outputs["output_ids"][0][0][:length].tolist()
+    
+    def _detect_prompt(self, mel):
+        """Build the decoder prompt with the language token the model predicts after <|startoftranscript|>."""
+        tokenizer = self.tokenizer
+        predicted = self._generate(mel, [tokenizer.sot], 1)[-1]
+        if predicted in tokenizer.all_language_tokens:
+            return [tokenizer.sot, predicted, tokenizer.transcribe, tokenizer.no_timestamps]
+        return list(tokenizer.sot_sequence_including_notimestamps)
+    
+    def transcribe(self, audio):
+        """Transcribe an audio file path or 16 kHz float32 array in 30 second windows."""
+        torch = self.torch
+        window_samples = self.whisper.audio.N_SAMPLES
+        if isinstance(audio, str):
+            audio = self.whisper.load_audio(audio)
+        
+        texts = []
+        prompt = None
+        for start in range(0, max(len(audio), 1), window_samples):
+            window = self.whisper.pad_or_trim(audio[start:start + window_samples])
+            mel = self.whisper.log_mel_spectrogram(window, self.n_mels)
+            mel = mel.to("cuda", torch.float16)
+            
+            if prompt is None:
+                prompt = self._detect_prompt(mel)
+            token_ids = self._generate(mel, prompt, self.max_new_tokens)
+            texts.append(self.tokenizer.decode([t for t in token_ids if t < self.tokenizer.eot]))
+        
+        return {"text": "".join(texts)}
+
+
+class JobStore:
+    """
+    Thread-safe, bounded store for job status dictionaries.
+    
+    Worker threads update jobs while the HTTP handler reads them, so every
+    access takes the lock. Finished jobs older than ``ttl`` seconds are dropped
+    by ``reap()``, and the least recently used entries are evicted once more
+    than ``max_jobs`` are stored. Each job's JSON encoding is cached until the
+    job next changes, so repeated status reads don't re-serialize it.
+    """
+    
+    def __init__(self, max_jobs=1000, ttl=3600):
+        self.max_jobs = max_jobs
+        self.ttl = ttl
+        self._jobs = OrderedDict()
+        self._encoded = {}
+        self._lock = threading.RLock()
+        self._changed = threading.Condition(self._lock)
+        self.generation = 0
+    
+    def _notify(self):
+        self.generation += 1
+        self._changed.notify_all()
+    
+    def create(self, job_id, info):
+        with self._lock:
+            self._jobs[job_id] = info
+            self._encoded.pop(job_id, None)
+            while len(self._jobs) > self.max_jobs:
+                evicted, _ = self._jobs.popitem(last=False)
+                self._encoded.pop(evicted, None)
+            self._notify()
+    
+    def update(self, job_id, **fields):
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
+                self._encoded.pop(job_id, None)
+                self._notify()
+    
+    def wait_for_change(self, generation, timeout=None):
+        """Block until any job changes after ``generation``; return the new generation."""
+        with self._lock:
+            self._changed.wait_for(lambda: self.generation != generation, timeout)
+            return self.generation
+    
+    def get(self, job_id):
+        """Return a copy of the job's status, or None if it is unknown."""
+        with self._lock:
+            info = self._jobs.get(job_id)
+            if info is None:
+                return None
+            self._jobs.move_to_end(job_id)
+            return dict(info)
+    
+    def get_json(self, job_id):
+        """Return the job's status as JSON bytes, or None if it is unknown."""
+        with self._lock:
+            info = self._jobs.get(job_id)
+            if info is None:
+                return None
+            self._jobs.move_to_end(job_id)
+            encoded = self._encoded.get(job_id)
+            if encoded is None:
+                encoded = self._encoded[job_id] = encode_json(info)
+            return encoded
+    
+    def is_finished(self, job_id):
+        """Return True if the job has completed, failed, or is unknown."""
+        with self._lock:
+            info = self._jobs.get(job_id)
+            return info is None or info['status'] in ('completed', 'error')
+    
+    def reap(self):
+        """Drop finished jobs older than the TTL."""
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            expired = [
+                job_id for job_id, info in self._jobs.items()
+                if info['status'] in ('completed', 'error') and info['created_at'] < cutoff
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+                self._encoded.pop(job_id, None)
+        return len(expired)
+
+
 class SimpleAudioToTextWebServer:
     """
     A simplified web-based audio to text converter that uses Whisper for background processing.
     """
     
-    def __init__(self, port=8080):
+    def __init__(self, port=8080, max_workers=WHISPER_BATCH_SIZE):
         self.port = port
         self.server = None
         self.html_content = self._get_html_content()
-        self.processing_jobs = {}
+        # Minify and compress the page once; the uncompressed copy is sent straight from disk
+        page = minify_html(self.html_content).encode('utf-8')
+        self.html_etag = f'W/"{hashlib.blake2b(page, digest_size=8).hexdigest()}"'
+        self.html_encoded = {'gzip': gzip.compress(page, 9)}
+        if BROTLI_AVAILABLE:
+            self.html_encoded['br'] = brotli.compress(page, quality=11)
+        self.processing_jobs = JobStore()
         self.temp_dir = tempfile.mkdtemp()
-        
-        # Try to import Whisper
-        self.whisper_available = False
-        try:
-            import whisper
-            self.whisper = whisper
-            self.whisper_available = True
-            print("✓ Whisper available for background processing")
-        except ImportError:
-            print("! Whisper not available - install with: pip install openai-whisper")
+        threading.Thread(target=self._reap, daemon=True).start()
+        
+        # Jobs run on a fixed pool of workers; queued job ids are kept in order
+        # so the status endpoint can report a queue position. Each worker blocks
+        # until its Whisper batch finishes, so the pool needs a full batch of
+        # workers for that many jobs to be batched together
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._pending_jobs = deque()
+        self._pending_lock = threading.Lock()
+        
+        # Whisper model is loaded once on first use and shared by all jobs
+        self._model = None
+        self._model_lock = threading.Lock()
+        # Backends without their own batching worker hold a single, non-reentrant
+        # inference context, so executor workers take turns on it
+        self._inference_lock = threading.Lock()
+        
+        # Pick a Whisper backend: WHISPER_BACKEND if set, else faster-whisper, else openai-whisper
+        self.backend = self._detect_backend()
+        self.whisper_available = self.backend is not None
+        if self.whisper_available:
+            print(f"✓ Whisper available for background processing ({self.backend.value} backend)")
+        else:
+            print("! Whisper not available - install with: pip install faster-whisper")
+        
+        # openai-whisper jobs are funnelled through one worker that batches the encoder
+        self.job_queue = queue.Queue()
+        if self.backend is WhisperBackend.OPENAI:
+            threading.Thread(target=self._whisper_worker, daemon=True).start()
+        
+        # Load and warm the model in the background so the first upload doesn't pay for it
+        self.ready = threading.Event()
+        if self.whisper_available:
+            threading.Thread(target=self._warmup, daemon=True).start()
+        else:
+            self.ready.set()
     
-    def cleanup(self):
-        """Clean up temporary files and resources."""
+    def _warmup(self):
+        """Load the model and run two passes over silence before marking the server ready."""
         try:
-            if os.path.exists(self.temp_dir):
-                shutil.rmtree(self.temp_dir)
-        except:
-            pass
+            import numpy
+            silence = numpy.zeros(16000 * 2, dtype=numpy.float32)
+            # The second pass replays any CUDA graphs captured during the first
+            for _ in range(2):
+                self._transcribe(silence)
+            print("✓ Whisper model warmed up")
+        except Exception as e:
+            print(f"! Whisper warmup failed: {e}")
+        finally:
+            self.ready.set()
     
-    def _get_html_content(self):
-        """Generate the HTML content for the web interface."""
-        return """
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Simple Audio to Text Converter</title>
-    <style>
-        body {
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            max-width: 800px;
-            margin: 0 auto;
-            padding: 20px;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: #333;
-            min-height: 100vh;
-        }
-        
-        .container {
-            background: white;
-            border-radius: 15px;
-            padding: 30px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.3);
-        }
-        
-        h1 {
-            color: #4a5568;
-            text-align: center;
-            margin-bottom: 30px;
-            font-size: 2.5em;
-        }
-        
-        .upload-area {
-            border: 3px dashed #cbd5e0;
-            border-radius: 10px;
-            padding: 40px;
-            text-align: center;
-            margin: 20px 0;
-            transition: all 0.3s ease;
-            background: #f7fafc;
-        }
-        
-        .upload-area.dragover {
-            border-color: #667eea;
-            background: #e6fffa;
-        }
-        
-        .upload-area input[type="file"] {
-            display: none;
-        }
-        
-        .upload-btn {
-            background: #667eea;
-            color: white;
-            padding: 12px 24px;
-            border: none;
-            border-radius: 8px;
-            cursor: pointer;
-            font-size: 16px;
-            transition: all 0.3s ease;
-        }
-        
-        .upload-btn:hover {
-            background: #5a67d8;
-            transform: translateY(-2px);
-        }
-        
-        .controls {
-            display: flex;
-            gap: 10px;
-            justify-content: center;
-            margin: 20px 0;
-            flex-wrap: wrap;
-        }
-        
-        .btn {
-            padding: 10px 20px;
-            border: none;
-            border-radius: 6px;
-            cursor: pointer;
-            font-size: 14px;
-            transition: all 0.3s ease;
-        }
-        
-        .btn-primary {
-            background: #38a169;
-            color: white;
-        }
-        
-        .btn-primary:hover {
-            background: #2f855a;
-        }
-        
-        .btn-secondary {
-            background: #718096;
-            color: white;
-        }
-        
-        .btn-secondary:hover {
-            background: #4a5568;
-        }
-        
-        .btn:disabled {
-            opacity: 0.5;
-            cursor: not-allowed;
-        }
-        
-        .audio-player {
-            margin: 20px 0;
-            text-align: center;
-        }
-        
-        audio {
-            width: 100%;
-            max-width: 400px;
-        }
-        
-        .transcription-area {
-            margin: 20px 0;
-        }
-        
-        .transcription-area textarea {
-            width: 100%;
-            min-height: 200px;
-            padding: 15px;
-            border: 2px solid #e2e8f0;
-            border-radius: 8px;
-            font-size: 16px;
-            line-height: 1.5;
-            resize: vertical;
-        }
-        
-        .transcription-area textarea:focus {
-            outline: none;
-            border-color: #667eea;
-            box-shadow: 0 0 0 3px rgba(102, 126, 234, 0.1);
-        }
-        
-        .status {
-            margin: 10px 0;
-            padding: 10px;
-            border-radius: 6px;
-            text-align: center;
-        }
-        
-        .status.success {
-            background: #c6f6d5;
-            color: #22543d;
-        }
-        
-        .status.error {
-            background: #fed7d7;
-            color: #742a2a;
-        }
-        
-        .status.info {
-            background: #bee3f8;
-            color: #2c5282;
-        }
-        
-        .processing {
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            gap: 10px;
-        }
-        
-        .spinner {
-            width: 20px;
-            height: 20px;
-            border: 2px solid #f3f3f3;
-            border-top: 2px solid #667eea;
-            border-radius: 50%;
-            animation: spin 1s linear infinite;
-        }
-        
-        @keyframes spin {
-            0% { transform: rotate(0deg); }
-            100% { transform: rotate(360deg); }
-        }
-        
-        .progress-bar {
-            width: 100%;
-            height: 8px;
-            background: #e2e8f0;
-            border-radius: 4px;
-            margin-top: 10px;
-            overflow: hidden;
-        }
-        
-        .progress-fill {
-            height: 100%;
-            background: #667eea;
-            width: 0%;
-            transition: width 0.3s ease;
-        }
-        
-        .info-box {
-            background: #f7fafc;
-            border-left: 4px solid #667eea;
-            padding: 15px;
-            margin: 20px 0;
-            border-radius: 0 8px 8px 0;
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>🎵 Simple Audio to Text Converter</h1>
-        
-        <div class="info-box">
-            <h3>How it works:</h3>
-            <p>• Upload an audio file (MP3, WAV, M4A, etc.)</p>
-            <p>• Click "Convert with Whisper" for offline processing</p>
-            <p>• Wait for the conversion to complete</p>
-            <p>• Download your transcription as a text file</p>
-            <p><strong>Note:</strong> This uses OpenAI Whisper for accurate offline transcription</p>
-        </div>
-        
-        <!-- File Upload Section -->
-        <div class="upload-area" id="uploadArea">
-            <p>📁 Drop audio files here or click to browse</p>
-            <input type="file" id="audioFile" accept="audio/*">
-            <button class="upload-btn" onclick="document.getElementById('audioFile').click()">
-                Choose Audio File
-            </button>
-        </div>
-        
-        <!-- Audio Player -->
-        <div class="audio-player" id="audioPlayer" style="display: none;">
-            <audio controls id="audioElement"></audio>
-            <p id="fileName"></p>
-        </div>
-        
-        <!-- Control Buttons -->
-        <div class="controls">
-            <button class="btn btn-primary" id="convertBtn" onclick="convertAudio()" disabled>
-                ⚡ Convert with Whisper
-            </button>
-            <button class="btn btn-secondary" onclick="clearAll()">
-                Clear All
-            </button>
-            <button class="btn btn-secondary" onclick="downloadText()" id="downloadBtn" disabled>
-                📥 Download Text
-            </button>
-        </div>
-        
-        <!-- Status Display -->
-        <div id="status"></div>
-        
-        <!-- Processing Progress -->
-        <div id="processingProgress" style="display: none;">
-            <div class="status info processing">
-                <span id="progressText">Processing...</span>
-                <div class="spinner"></div>
-            </div>
-            <div class="progress-bar">
-                <div class="progress-fill" id="progressFill"></div>
-            </div>
-        </div>
-        
-        <!-- Transcription Area -->
-        <div class="transcription-area">
-            <h3>Transcription Result:</h3>
-            <textarea id="transcriptionText" placeholder="Transcribed text will appear here..."></textarea>
-        </div>
-    </div>
-
-    <script>
-        let currentAudioFile = null;
-        let pollInterval = null;
+    def _detect_backend(self):
+        """Return the first importable WhisperBackend, honouring WHISPER_BACKEND."""
+        order = [WhisperBackend.FASTER, WhisperBackend.OPENAI]
+        requested = os.environ.get("WHISPER_BACKEND", "").lower()
+        if requested:
+            try:
+                order.insert(0, WhisperBackend(requested))
+            except ValueError:
+                print(f"! Unknown WHISPER_BACKEND '{requested}', using default order")
         
-        const uploadArea = document.getElementById('uploadArea');
-        const audioFile = document.getElementById('audioFile');
-        const audioPlayer = document.getElementById('audioPlayer');
-        const audioElement = document.getElementById('audioElement');
-        const fileName = document.getElementById('fileName');
-        const convertBtn = document.getElementById('convertBtn');
-        const transcriptionText = document.getElementById('transcriptionText');
+        for backend in order:
+            try:
+                if backend is WhisperBackend.FASTER:
+                    from faster_whisper import WhisperModel
+                    self.WhisperModel = WhisperModel
+                elif backend is WhisperBackend.WHISPERCPP:
+                    from pywhispercpp.model import Model
+                    self.WhisperCppModel = Model
+                else:
+                    if backend is WhisperBackend.TRTLLM and importlib.util.find_spec("tensorrt_llm") is None:
+                        raise ImportError("tensorrt_llm is not installed")
+                    import whisper
+                    self.whisper = whisper
+                return backend
+            except ImportError:
+                if backend.value == requested:
+                    print(f"! {backend.value} backend requested but not installed")
+        return None
+    
+    def _get_model(self):
+        """Return the shared Whisper model, loading it on first use."""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    model_name = os.environ.get("WHISPER_MODEL", "base")
+                    print(f"Loading Whisper model '{model_name}' ({self.backend.value} backend)...")
+                    if self.backend is WhisperBackend.TRTLLM:
+                        engine_dir = os.environ.get("TRTLLM_ENGINE_DIR", f"whisper_{model_name}")
+                        self._model = TrtLlmWhisperModel(engine_dir, self.whisper)
+                    elif self.backend is WhisperBackend.WHISPERCPP:
+                        # A path to a quantized ggml file (e.g. ggml-base.en-q5_0.bin)
+                        # or a model name that pywhispercpp downloads itself
+                        self._model = self.WhisperCppModel(
+                            os.environ.get("WHISPERCPP_MODEL", model_name),
+                            n_threads=os.cpu_count(),
+                            print_progress=False
+                        )
+                    elif self.backend is WhisperBackend.FASTER:
+                        import ctranslate2
+                        cuda = ctranslate2.get_cuda_device_count() > 0
+                        self._model = self.WhisperModel(
+                            model_name,
+                            device="auto",
+                            compute_type="int8_float16" if cuda else "int8"
+                        )
+                    else:
+                        # load_model places the model on CUDA when it is available
+                        self._model = self._compile_model(self.whisper.load_model(model_name))
+        return self._model
+    
+    def _compile_model(self, model):
+        """
+        Compile the openai-whisper encoder with torch.compile on CUDA.
         
-        // File upload handling
-        uploadArea.addEventListener('dragover', (e) => {
-            e.preventDefault();
-            uploadArea.classList.add('dragover');
-        });
+        The encoder always sees a fixed 30 s log-mel window, so it can be
+        captured once as a CUDA graph; two warmup passes trigger the capture
+        before the first real job arrives.
+        """
+        try:
+            import torch
+            if not torch.cuda.is_available() or not hasattr(torch, "compile"):
+                return model
+            
+            print("Compiling Whisper encoder with torch.compile...")
+            model.encoder.forward = torch.compile(
+                model.encoder.forward, mode="reduce-overhead", fullgraph=True
+            )
+            dummy = torch.randn((1, model.dims.n_mels, 3000), dtype=torch.float16, device="cuda")
+            with torch.no_grad():
+                for _ in range(2):
+                    model.encoder(dummy)
+            print("✓ Whisper encoder compiled")
+        except Exception as e:
+            print(f"! torch.compile unavailable, using eager Whisper: {e}")
+        return model
+    
+    def _load_audio(self, audio_path):
+        """
+        Decode an uploaded file to a float32 mono 16 kHz array in-process.
         
-        uploadArea.addEventListener('dragleave', () => {
-            uploadArea.classList.remove('dragover');
-        });
+        Returns the path unchanged when soundfile cannot read the format
+        (e.g. m4a) or a resample is needed without librosa, in which case the
+        backend decodes it with ffmpeg as before.
+        """
+        if not SOUNDFILE_AVAILABLE:
+            return audio_path
+        try:
+            data, sample_rate = sf.read(audio_path, dtype='float32')
+        except RuntimeError:
+            return audio_path
+        
+        if data.ndim > 1:
+            data = data.mean(axis=1)
+        if sample_rate != 16000:
+            if not LIBROSA_AVAILABLE:
+                return audio_path
+            data = librosa.resample(data, orig_sr=sample_rate, target_sr=16000)
+        return np.ascontiguousarray(data, dtype=np.float32)
+    
+    def _transcribe(self, audio, on_partial=None):
+        """
+        Transcribe an audio file with the active backend and return the text.
         
-        uploadArea.addEventListener('drop', (e) => {
-            e.preventDefault();
-            uploadArea.classList.remove('dragover');
-            const files = e.dataTransfer.files;
-            if (files.length > 0) {
-                handleFileSelection(files[0]);
-            }
-        });
+        ``audio`` is a file path or a float32 mono 16 kHz array from _load_audio().
         
-        audioFile.addEventListener('change', (e) => {
-            if (e.target.files.length > 0) {
-                handleFileSelection(e.target.files[0]);
+        ``on_partial(text, fraction)``, if given, is called with the transcript
+        so far and the fraction of the audio done as each piece is decoded.
+        """
+        model = self._get_model()
+        if self.backend is WhisperBackend.FASTER:
+            segments, info = model.transcribe(audio, beam_size=1, vad_filter=True)
+            # segments is a generator, so text becomes available as decoding proceeds
+            parts = []
+            for segment in segments:
+                parts.append(segment.text)
+                if on_partial and info.duration:
+                    on_partial("".join(parts).strip(), min(segment.end / info.duration, 1.0))
+            return "".join(parts).strip()
+        if self.backend is WhisperBackend.WHISPERCPP:
+            with self._inference_lock:
+                segments = model.transcribe(audio)
+            return " ".join(segment.text.strip() for segment in segments).strip()
+        if self.backend is WhisperBackend.OPENAI:
+            request = {
+                'audio': audio,
+                'on_partial': on_partial,
+                'done': threading.Event(),
+                'text': None,
+                'error': None
             }
-        });
+            self.job_queue.put(request)
+            request['done'].wait()
+            if request['error'] is not None:
+                raise request['error']
+            return request['text']
+        # The TensorRT-LLM runner is built for a batch of one
+        with self._inference_lock:
+            result = model.transcribe(audio)
+        return result["text"].strip()
+    
+    def _whisper_worker(self):
+        """Collect queued openai-whisper requests into micro-batches and run them."""
+        while True:
+            batch = [self.job_queue.get()]
+            deadline = time.time() + BATCH_WAIT_SECONDS
+            while len(batch) < WHISPER_BATCH_SIZE:
+                timeout = deadline - time.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self.job_queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            self._transcribe_batch(batch)
+    
+    def _transcribe_batch(self, requests):
+        """
+        Transcribe several files with shared encoder passes.
         
-        function handleFileSelection(file) {
-            if (!file.type.startsWith('audio/')) {
-                showStatus('Please select an audio file.', 'error');
-                return;
-            }
-            
-            const url = URL.createObjectURL(file);
-            audioElement.src = url;
-            fileName.textContent = file.name;
-            audioPlayer.style.display = 'block';
-            convertBtn.disabled = false;
-            currentAudioFile = file;
+        Every file is cut into 30 s log-mel windows, the windows of all
+        requests are stacked and encoded WHISPER_BATCH_SIZE at a time, and the
+        decoder then runs on the batch of encoded windows.
+        """
+        whisper = self.whisper
+        try:
+            import torch
+            model = self._get_model()
+            window_samples = whisper.audio.N_SAMPLES
             
-            showStatus(`Audio file "${file.name}" loaded successfully!`, 'success');
-        }
-        
-        async function convertAudio() {
-            if (!currentAudioFile) {
-                showStatus('Please select an audio file first.', 'error');
-                return;
-            }
+            mels, owners = [], []
+            for index, request in enumerate(requests):
+                try:
+                    audio = request['audio']
+                    if isinstance(audio, str):
+                        audio = whisper.load_audio(audio)
+                except Exception as e:
+                    request['error'] = e
+                    continue
+                for start in range(0, max(len(audio), 1), window_samples):
+                    window = whisper.pad_or_trim(audio[start:start + window_samples])
+                    mels.append(whisper.log_mel_spectrogram(window, model.dims.n_mels))
+                    owners.append(index)
             
-            showStatus('Starting conversion...', 'info');
-            showProgress('Uploading file...', 10);
+            window_counts = [owners.count(index) for index in range(len(requests))]
             
-            convertBtn.disabled = true;
+            options = whisper.DecodingOptions(
+                fp16=model.device.type == "cuda", without_timestamps=True
+            )
+            dtype = torch.float16 if options.fp16 else torch.float32
             
-            try {
-                // Convert file to base64 for simple transfer
-                const reader = new FileReader();
-                reader.onload = async function(e) {
-                    const audioData = e.target.result.split(',')[1]; // Remove data URL prefix
-                    
-                    // Send to server
-                    const response = await fetch('/api/convert', {
-                        method: 'POST',
-                        headers: {
-                            'Content-Type': 'application/json',
-                        },
-                        body: JSON.stringify({
-                            audio_data: audioData,
-                            filename: currentAudioFile.name
-                        })
-                    });
-                    
-                    const result = await response.json();
-                    
-                    if (result.success) {
-                        const jobId = result.job_id;
-                        showProgress('Processing with Whisper...', 25);
-                        pollForResults(jobId);
-                    } else {
-                        throw new Error(result.error || 'Unknown error');
-                    }
-                };
-                
-                reader.readAsDataURL(currentAudioFile);
+            texts = [[] for _ in requests]
+            for start in range(0, len(mels), WHISPER_BATCH_SIZE):
+                batch = torch.stack(mels[start:start + WHISPER_BATCH_SIZE]).to(model.device, dtype)
+                with torch.no_grad():
+                    features = model.encoder(batch)
+                # decode() skips the encoder when handed audio features
+                results = whisper.decode(model, features, options)
+                batch_owners = owners[start:start + WHISPER_BATCH_SIZE]
+                for owner, result in zip(batch_owners, results):
+                    texts[owner].append(result.text.strip())
                 
-            } catch (error) {
-                showStatus(`Conversion failed: ${error.message}`, 'error');
-                hideProgress();
-                convertBtn.disabled = false;
-            }
-        }
-        
-        async function pollForResults(jobId) {
-            let progress = 25;
-            
-            pollInterval = setInterval(async () => {
-                try {
-                    const response = await fetch(`/api/status/${jobId}`);
-                    const result = await response.json();
-                    
-                    if (result.status === 'completed') {
-                        clearInterval(pollInterval);
-                        hideProgress();
-                        
-                        if (result.success) {
-                            transcriptionText.value = result.text;
-                            showStatus('Conversion completed successfully!', 'success');
-                            document.getElementById('downloadBtn').disabled = false;
-                        } else {
-                            showStatus(`Conversion failed: ${result.error}`, 'error');
-                        }
-                        
-                        convertBtn.disabled = false;
-                        
-                    } else if (result.status === 'error') {
-                        clearInterval(pollInterval);
-                        hideProgress();
-                        showStatus(`Conversion failed: ${result.error}`, 'error');
-                        convertBtn.disabled = false;
-                        
-                    } else {
-                        // Still processing
-                        progress = Math.min(progress + 10, 90);
-                        showProgress('Processing with Whisper...', progress);
-                    }
-                    
-                } catch (error) {
-                    clearInterval(pollInterval);
-                    hideProgress();
-                    showStatus(`Error checking conversion status: ${error.message}`, 'error');
-                    convertBtn.disabled = false;
-                }
-            }, 2000); // Poll every 2 seconds
-        }
-        
-        function showProgress(message, percent) {
-            const progressDiv = document.getElementById('processingProgress');
-            const progressText = document.getElementById('progressText');
-            const progressFill = document.getElementById('progressFill');
-            
-            progressDiv.style.display = 'block';
-            progressText.textContent = message;
-            progressFill.style.width = `${percent}%`;
-        }
-        
-        function hideProgress() {
-            const progressDiv = document.getElementById('processingProgress');
-            progressDiv.style.display = 'none';
-            
-            if (pollInterval) {
-                clearInterval(pollInterval);
-                pollInterval = null;
-            }
-        }
-        
-        function clearAll() {
-            transcriptionText.value = '';
-            audioElement.src = '';
-            audioPlayer.style.display = 'none';
-            fileName.textContent = '';
-            convertBtn.disabled = true;
-            document.getElementById('downloadBtn').disabled = true;
-            currentAudioFile = null;
-            audioFile.value = '';
-            document.getElementById('status').innerHTML = '';
-            hideProgress();
-        }
-        
-        function downloadText() {
-            const text = transcriptionText.value;
-            if (!text.trim()) {
-                showStatus('No text to download.', 'error');
-                return;
-            }
-            
-            const blob = new Blob([text], { type: 'text/plain' });
-            const url = URL.createObjectURL(blob);
-            const a = document.createElement('a');
-            a.href = url;
-            a.download = 'transcription.txt';
-            document.body.appendChild(a);
-            a.click();
-            document.body.removeChild(a);
-            URL.revokeObjectURL(url);
+                for owner in set(batch_owners):
+                    on_partial = requests[owner]['on_partial']
+                    if on_partial:
+                        text = " ".join(part for part in texts[owner] if part)
+                        on_partial(text, len(texts[owner]) / window_counts[owner])
             
-            showStatus('Transcription downloaded successfully!', 'success');
-        }
-        
-        function showStatus(message, type) {
-            const status = document.getElementById('status');
-            status.innerHTML = `<div class="status ${type}">${message}</div>`;
-            
-            // Auto-hide after 5 seconds for success/info messages
-            if (type === 'success' || type === 'info') {
-                setTimeout(() => {
-                    status.innerHTML = '';
-                }, 5000);
-            }
-        }
-        
-        // Initialize
-        document.addEventListener('DOMContentLoaded', () => {
-            showStatus('Simple Audio to Text Converter loaded successfully!', 'success');
-        });
-    </script>
-</body>
-</html>
-        """
+            for request, parts in zip(requests, texts):
+                if request['error'] is None:
+                    request['text'] = " ".join(part for part in parts if part)
+        except Exception as e:
+            for request in requests:
+                if request['error'] is None and request['text'] is None:
+                    request['error'] = e
+        finally:
+            for request in requests:
+                request['done'].set()
     
-    def _process_audio_background(self, job_id, audio_data, filename):
-        """Process audio in background thread using Whisper."""
+    def submit_job(self, job_id, temp_file, filename):
+        """Queue an uploaded file for transcription on the worker pool."""
+        with self._pending_lock:
+            self._pending_jobs.append(job_id)
+            self.processing_jobs.update(job_id, queue_position=len(self._pending_jobs))
+        self.executor.submit(self._process_audio_background, job_id, temp_file, filename)
+    
+    def _reap(self):
+        """Periodically drop old finished jobs so the job table stays small."""
+        while True:
+            time.sleep(60)
+            removed = self.processing_jobs.reap()
+            if removed:
+                print(f"Removed {removed} expired job(s)")
+    
+    def cleanup(self):
+        """Clean up temporary files and resources."""
+        self.executor.shutdown(wait=False)
         try:
-            print(f"Starting Whisper processing for job {job_id}, file: {filename}")
-            
-            # Save audio data to temporary file
-            file_ext = Path(filename).suffix.lower() or '.wav'
-            temp_file = os.path.join(self.temp_dir, f"{job_id}{file_ext}")
-            
-            with open(temp_file, 'wb') as f:
-                f.write(audio_data)
+            if os.path.exists(self.temp_dir):
+                shutil.rmtree(self.temp_dir)
+        except:
+            pass
+    
+    def _get_html_content(self):
+        """Read the HTML for the web interface from static/index.html."""
+        return STATIC_INDEX.read_text(encoding='utf-8')
+    
+    def _process_audio_background(self, job_id, temp_file, filename):
+        """Process an uploaded audio file in background thread using Whisper."""
+        try:
+            with self._pending_lock:
+                try:
+                    self._pending_jobs.remove(job_id)
+                except ValueError:
+                    pass
+                # Everyone behind this job moves up one place
+                for position, waiting_id in enumerate(self._pending_jobs, 1):
+                    self.processing_jobs.update(waiting_id, queue_position=position)
             
-            print(f"Audio data saved to {temp_file}, size: {len(audio_data)} bytes")
+            print(f"Starting Whisper processing for job {job_id}, file: {filename}")
             
-            self.processing_jobs[job_id]['status'] = 'processing'
-            self.processing_jobs[job_id]['progress'] = 50
+            self.processing_jobs.update(job_id, status='processing', progress=50, queue_position=0)
             
             if self.whisper_available:
                 try:
-                    print(f"Loading Whisper model for job {job_id}")
-                    model = self.whisper.load_model("base")
                     print(f"Transcribing with Whisper for job {job_id}")
-                    result = model.transcribe(temp_file)
-                    text = result["text"].strip()
+                    
+                    def report_partial(partial_text, fraction):
+                        self.processing_jobs.update(
+                            job_id,
+                            partial_text=partial_text,
+                            progress=50 + int(45 * fraction)
+                        )
+                    
+                    audio = self._load_audio(temp_file)
+                    text = self._transcribe(audio, on_partial=report_partial)
                     
                     print(f"Whisper transcription completed for job {job_id}: {text[:100]}...")
                     
-                    self.processing_jobs[job_id].update({
-                        'status': 'completed',
-                        'success': True,
-                        'text': text,
-                        'progress': 100
-                    })
+                    self.processing_jobs.update(
+                        job_id,
+                        status='completed',
+                        success=True,
+                        text=text,
+                        progress=100
+                    )
                 except Exception as e:
                     print(f"Whisper error for job {job_id}: {str(e)}")
-                    self.processing_jobs[job_id].update({
-                        'status': 'error',
-                        'success': False,
-                        'error': f"Whisper processing failed: {str(e)}"
-                    })
+                    self.processing_jobs.update(
+                        job_id,
+                        status='error',
+                        success=False,
+                        error=f"Whisper processing failed: {str(e)}"
+                    )
             else:
-                error_msg = "Whisper not available. Please install with: pip install openai-whisper"
+                error_msg = "Whisper not available. Please install with: pip install faster-whisper (or openai-whisper)"
                 print(f"Whisper not available for job {job_id}")
-                self.processing_jobs[job_id].update({
-                    'status': 'error',
-                    'success': False,
-                    'error': error_msg
-                })
+                self.processing_jobs.update(
+                    job_id,
+                    status='error',
+                    success=False,
+                    error=error_msg
+                )
             
             # Clean up temporary file
             try:
@@ -595,18 +650,21 @@ class SimpleAudioToTextWebServer:
             print(f"Unexpected error in background processing for job {job_id}: {str(e)}")
             import traceback
             traceback.print_exc()
-            self.processing_jobs[job_id].update({
-                'status': 'error',
-                'success': False,
-                'error': f"Unexpected error: {str(e)}"
-            })
+            self.processing_jobs.update(
+                job_id,
+                status='error',
+                success=False,
+                error=f"Unexpected error: {str(e)}"
+            )
     
     def start_server(self):
         """Start the web server."""
         handler = self._create_handler()
         
         try:
-            self.server = socketserver.TCPServer(("", self.port), handler)
+            # One thread per connection so status polls are answered while uploads stream in
+            self.server = http.server.ThreadingHTTPServer(("", self.port), handler)
+            self.server.daemon_threads = True
             print(f"Simple Audio to Text Converter started!")
             print(f"Open your browser and go to: http://localhost:{self.port}")
             print("Press Ctrl+C to stop the server")
@@ -627,80 +685,199 @@ class SimpleAudioToTextWebServer:
     
     def _create_handler(self):
         """Create the HTTP request handler."""
-        html_content = self.html_content
+        html_encoded = self.html_encoded
+        html_etag = self.html_etag
         server_instance = self
         
         class SimpleAudioToTextHandler(http.server.SimpleHTTPRequestHandler):
             def do_GET(self):
                 if self.path == '/' or self.path == '':
+                    if self.headers.get('If-None-Match') == html_etag:
+                        self.send_response(304)
+                        self.send_header('ETag', html_etag)
+                        self.end_headers()
+                        return
+                    
+                    accept_encoding = self.headers.get('Accept-Encoding', '')
+                    encoding = next(
+                        (name for name in ('br', 'gzip') if name in html_encoded and name in accept_encoding),
+                        None
+                    )
+                    if encoding:
+                        body = html_encoded[encoding]
+                        self.send_response(200)
+                        self.send_header('Content-type', 'text/html; charset=utf-8')
+                        self.send_header('Content-Length', str(len(body)))
+                        self.send_header('Cache-Control', 'public, max-age=3600')
+                        self.send_header('Vary', 'Accept-Encoding')
+                        self.send_header('ETag', html_etag)
+                        self.send_header('Content-Encoding', encoding)
+                        self.end_headers()
+                        self.wfile.write(body)
+                    else:
+                        self._send_static_file(STATIC_INDEX, 'text/html; charset=utf-8', html_etag)
+                    
+                elif self.path == '/api/status':
+                    response = encode_json({
+                        'server_ready': server_instance.ready.is_set(),
+                        'whisper_available': server_instance.whisper_available,
+                        'backend': server_instance.backend.value if server_instance.backend else None
+                    })
+                    
                     self.send_response(200)
-                    self.send_header('Content-type', 'text/html')
+                    self.send_header('Content-type', 'application/json')
+                    self.send_header('Content-Length', str(len(response)))
+                    self.send_header('Access-Control-Allow-Origin', '*')
                     self.end_headers()
-                    self.wfile.write(html_content.encode())
+                    self.wfile.write(response)
                     
                 elif self.path.startswith('/api/status/'):
                     # Get job status
                     job_id = self.path.split('/')[-1]
                     
-                    if job_id in server_instance.processing_jobs:
-                        job_info = server_instance.processing_jobs[job_id]
-                        response = json.dumps(job_info)
-                    else:
-                        response = json.dumps({
-                            'status': 'error',
-                            'error': 'Job not found'
-                        })
+                    response = server_instance.processing_jobs.get_json(job_id) or JOB_NOT_FOUND
                     
                     self.send_response(200)
                     self.send_header('Content-type', 'application/json')
+                    self.send_header('Content-Length', str(len(response)))
                     self.send_header('Access-Control-Allow-Origin', '*')
                     self.end_headers()
-                    self.wfile.write(response.encode())
+                    self.wfile.write(response)
+                    
+                elif self.path.startswith('/api/events/'):
+                    self._stream_job_events(self.path.split('/')[-1])
                     
                 else:
                     super().do_GET()
             
+            def _save_upload(self, path, length):
+                """
+                Copy ``length`` bytes of the request body into ``path``.
+                
+                The file is preallocated so the filesystem reserves its extents
+                up front, and the body is read into one reusable buffer and
+                written with os.write, avoiding a new bytes object per chunk.
+                Returns the number of bytes that never arrived.
+                """
+                flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+                fd = os.open(path, flags, 0o600)
+                try:
+                    if hasattr(os, 'posix_fallocate'):
+                        try:
+                            os.posix_fallocate(fd, 0, length)
+                        except OSError:
+                            pass
+                    
+                    view = memoryview(bytearray(1 << 20))
+                    remaining = length
+                    while remaining:
+                        n = self.rfile.readinto(view[:min(len(view), remaining)])
+                        if not n:
+                            break
+                        written = 0
+                        while written < n:
+                            written += os.write(fd, view[written:n])
+                        remaining -= n
+                    return remaining
+                finally:
+                    os.close(fd)
+            
+            def _send_static_file(self, path, content_type, etag=None):
+                """Send a file with sendfile(2) where available, copying otherwise."""
+                with open(path, 'rb') as f:
+                    size = os.fstat(f.fileno()).st_size
+                    
+                    self.send_response(200)
+                    self.send_header('Content-type', content_type)
+                    self.send_header('Content-Length', str(size))
+                    self.send_header('Cache-Control', 'public, max-age=3600')
+                    self.send_header('Vary', 'Accept-Encoding')
+                    if etag:
+                        self.send_header('ETag', etag)
+                    self.end_headers()
+                    
+                    if hasattr(os, 'sendfile'):
+                        offset = 0
+                        while offset < size:
+                            sent = os.sendfile(self.connection.fileno(), f.fileno(), offset, size - offset)
+                            if sent == 0:
+                                break
+                            offset += sent
+                    else:
+                        shutil.copyfileobj(f, self.wfile)
+            
+            def _stream_job_events(self, job_id):
+                """Push job status as Server-Sent Events until the job finishes."""
+                jobs = server_instance.processing_jobs
+                
+                self.send_response(200)
+                self.send_header('Content-type', 'text/event-stream')
+                self.send_header('Cache-Control', 'no-cache')
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.end_headers()
+                
+                last_payload = None
+                generation = jobs.generation
+                try:
+                    while True:
+                        finished = jobs.is_finished(job_id)
+                        payload = jobs.get_json(job_id) or JOB_NOT_FOUND
+                        if payload != last_payload:
+                            self.wfile.write(b"data: " + payload + b"\n\n")
+                            self.wfile.flush()
+                            last_payload = payload
+                        
+                        if finished:
+                            break
+                        
+                        new_generation = jobs.wait_for_change(generation, timeout=15)
+                        if new_generation == generation:
+                            # Comment line keeps proxies from closing an idle stream
+                            self.wfile.write(b": keepalive\n\n")
+                            self.wfile.flush()
+                        generation = new_generation
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+            
             def do_POST(self):
-                if self.path == '/api/convert':
+                parsed = urlparse(self.path)
+                if parsed.path == '/api/convert':
                     try:
-                        # Read JSON data
+                        # Body is the raw audio file; filename comes from the query string
                         content_length = int(self.headers.get('Content-Length', 0))
                         if content_length == 0:
-                            raise ValueError("No content received")
-                        
-                        post_data = self.rfile.read(content_length)
-                        data = json.loads(post_data.decode('utf-8'))
-                        
-                        audio_data_b64 = data.get('audio_data')
-                        filename = data.get('filename', 'audio.wav')
-                        
-                        if not audio_data_b64:
                             raise ValueError("No audio data received")
                         
-                        # Decode base64 audio data
-                        audio_data = base64.b64decode(audio_data_b64)
+                        query = parse_qs(parsed.query)
+                        filename = os.path.basename(query.get('filename', ['audio.wav'])[0]) or 'audio.wav'
                         
                         # Create job ID
                         job_id = str(uuid.uuid4())
                         
+                        # Stream the body to disk in 1 MB chunks instead of buffering it
+                        file_ext = Path(filename).suffix.lower() or '.wav'
+                        temp_file = os.path.join(server_instance.temp_dir, f"{job_id}{file_ext}")
+                        
+                        remaining = self._save_upload(temp_file, content_length)
+                        if remaining:
+                            os.remove(temp_file)
+                            raise ValueError("Upload ended before all audio data was received")
+                        
+                        print(f"Audio data saved to {temp_file}, size: {content_length} bytes")
+                        
                         # Initialize job
-                        server_instance.processing_jobs[job_id] = {
+                        server_instance.processing_jobs.create(job_id, {
                             'status': 'queued',
                             'progress': 0,
                             'filename': filename,
                             'created_at': time.time()
-                        }
+                        })
                         
-                        # Start processing in background
-                        thread = threading.Thread(
-                            target=server_instance._process_audio_background,
-                            args=(job_id, audio_data, filename)
-                        )
-                        thread.daemon = True
-                        thread.start()
+                        # Queue for processing on the worker pool
+                        server_instance.submit_job(job_id, temp_file, filename)
                         
                         # Return job ID
-                        response = json.dumps({
+                        response = encode_json({
                             'success': True,
                             'job_id': job_id,
                             'message': 'Processing started'
@@ -710,7 +887,7 @@ class SimpleAudioToTextWebServer:
                         self.send_header('Content-type', 'application/json')
                         self.send_header('Access-Control-Allow-Origin', '*')
                         self.end_headers()
-                        self.wfile.write(response.encode())
+                        self.wfile.write(response)
                         
                     except Exception as e:
                         # Log the full error for debugging
@@ -718,7 +895,7 @@ class SimpleAudioToTextWebServer:
                         import traceback
                         traceback.print_exc()
                         
-                        error_response = json.dumps({
+                        error_response = encode_json({
                             'success': False,
                             'error': str(e)
                         })
@@ -727,7 +904,7 @@ class SimpleAudioToTextWebServer:
                         self.send_header('Content-type', 'application/json')
                         self.send_header('Access-Control-Allow-Origin', '*')
                         self.end_headers()
-                        self.wfile.write(error_response.encode())
+                        self.wfile.write(error_response)
                 
                 else:
                     self.send_error(404)
@@ -14,41 +14,41 @@ def find_free_port():
         port = s.getsockname()[1]
     return port
 
+def _port_free(port):
+    """Check whether a port can be bound, without building a server."""
+    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        s.bind(('', port))
+        return True
+    except OSError:
+        return False
+    finally:
+        s.close()
+
 def main():
     """Start the web converter on an available port."""
     print("Finding available port...")
     
-    # Try common ports first
+    # Try common ports first; probe them before constructing the server so
+    # a busy port doesn't cost a server (temp dir, engines) setup
     preferred_ports = [8080, 8081, 8000, 8888, 9000]
     
     for port in preferred_ports:
-        try:
-            server = AudioToTextWebServer(port)
-            print(f"Trying port {port}...")
-            server.start_server()
-            break
-        except OSError as e:
-            if "Only one usage" in str(e) or "Address already in use" in str(e):
-                print(f"Port {port} is already in use, trying next...")
-                continue
-            else:
-                print(f"Error on port {port}: {e}")
-                continue
-        except KeyboardInterrupt:
-            print("\nServer stopped by user.")
+        if _port_free(port):
             break
-        except Exception as e:
-            print(f"Error on port {port}: {e}")
-            continue
+        print(f"Port {port} is already in use, trying next...")
     else:
-        # If all preferred ports fail, find any free port
-        try:
-            free_port = find_free_port()
-            print(f"Using automatically found port: {free_port}")
-            server = AudioToTextWebServer(free_port)
-            server.start_server()
-        except Exception as e:
-            print(f"Failed to start server: {e}")
+        # If all preferred ports are busy, find any free port
+        port = find_free_port()
+        print(f"Using automatically found port: {port}")
+    
+    try:
+        server = AudioToTextWebServer(port)
+        server.start_server()
+    except KeyboardInterrupt:
+        print("\nServer stopped by user.")
+    except Exception as e:
+        print(f"Failed to start server: {e}")
 
 if __name__ == "__main__":
     main()
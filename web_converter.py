@@ -4,19 +4,254 @@ This solution works with any Python version and doesn't require problematic audi
 """
 
 import http.server
-import socketserver
+import gc
+import gzip
+import hashlib
+import io
 import json
 import base64
+import logging
+import logging.handlers
 import os
+import sys
 import tempfile
 import threading
+import queue
 import webbrowser
 import time
-import uuid
+import secrets
 import shutil
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from email.parser import BytesHeaderParser
+from email.utils import collapse_rfc2231_value
 from pathlib import Path
 from urllib.parse import parse_qs, urlparse
 
+# Optional fast JSON encoder for the status endpoints; falls back to the standard library
+try:
+    import orjson
+    
+    def encode_json(obj):
+        return orjson.dumps(obj)
+except ImportError:
+    def encode_json(obj):
+        return json.dumps(obj).encode()
+
+# Job and request logs go through a queue so worker threads never block on the console;
+# the listener is started by start_server. LOG_LEVEL=WARNING keeps production quiet.
+logger = logging.getLogger("web_converter")
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO").upper())
+logger.propagate = False
+_log_queue = queue.Queue(-1)
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+_log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+
+JOB_NOT_FOUND = encode_json({'status': 'error', 'error': 'Job not found'})
+
+# Optional: compiled frame-energy loop for the energy VAD fallback
+try:
+    import numba
+    import numpy as np
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Number of Whisper models (by size) kept resident between jobs
+MODEL_CACHE_SIZE = int(os.environ.get("MODEL_CACHE_SIZE", "3"))
+# A model size, or for faster-whisper also a directory made by ct2-transformers-converter
+WHISPER_MODEL = os.environ.get("WHISPER_MODEL", "base")
+
+# Whisper jobs arriving within BATCH_WAIT_SECONDS share forward passes
+WHISPER_BATCH_SIZE = int(os.environ.get("WHISPER_BATCH_SIZE", "16"))
+BATCH_WAIT_SECONDS = int(os.environ.get("WHISPER_BATCH_WAIT_MS", "50")) / 1000
+# Minimum seconds between partial-text updates; each one copies the whole text so far
+PARTIAL_INTERVAL_SECONDS = float(os.environ.get("PARTIAL_INTERVAL_SECONDS", "1.0"))
+# CPU threads that decode and featurize queued audio while the model runs the previous batch
+DECODE_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+
+# VAD chunking: 30 ms frames, cut on >= 100 ms of silence, chunks up to one Whisper window
+VAD_FRAME_MS = 30
+VAD_MIN_SILENCE_MS = 100
+VAD_MAX_CHUNK_SECONDS = 30
+# Without webrtcvad, frames whose RMS is below this (about -40 dBFS) count as silence
+VAD_ENERGY_THRESHOLD = 0.01
+
+# Background job workers; at least a full Whisper batch so jobs can share forward passes
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", str(WHISPER_BATCH_SIZE)))
+# Uploads beyond this many unfinished jobs are turned away with 503 instead of piling up
+MAX_PENDING_JOBS = int(os.environ.get("MAX_PENDING_JOBS", "64"))
+# Google jobs mostly wait on the network, so they get their own pool sized for every pending job
+GOOGLE_WORKERS = int(os.environ.get("GOOGLE_WORKERS", str(MAX_PENDING_JOBS)))
+# Seconds before a stalled Google request gives its worker back
+GOOGLE_TIMEOUT = float(os.environ.get("GOOGLE_TIMEOUT", "30"))
+
+# Uploads are parsed in 64 KB reads; audio above UPLOAD_SPOOL_SIZE spills to temp_dir
+MULTIPART_CHUNK_SIZE = 64 * 1024
+UPLOAD_SPOOL_SIZE = 8 * 1024 * 1024
+MAX_FORM_FIELD_SIZE = 64 * 1024
+
+# Finished jobs are forgotten this long after they complete; the janitor checks every minute
+JOB_TTL_SECONDS = int(os.environ.get("JOB_TTL_SECONDS", "3600"))
+JOB_SWEEP_SECONDS = 60
+
+# Completed transcriptions by upload hash, kept in memory. Setting TRANSCRIPT_CACHE_DIR
+# also keeps up to TRANSCRIPT_CACHE_FILES of them on disk across restarts; off by default
+# because transcripts are user data
+RESULT_CACHE_SIZE = int(os.environ.get("RESULT_CACHE_SIZE", "256"))
+RESULT_CACHE_DIR = Path(os.environ["TRANSCRIPT_CACHE_DIR"]) if os.environ.get("TRANSCRIPT_CACHE_DIR") else None
+RESULT_CACHE_FILES = int(os.environ.get("TRANSCRIPT_CACHE_FILES", "1000"))
+
+if NUMBA_AVAILABLE:
+    @numba.njit(cache=True, fastmath=True, parallel=True)
+    def frame_energies(audio, frame):
+        """RMS energy of each complete frame of float32 audio."""
+        count = len(audio) // frame
+        energies = np.empty(count, dtype=np.float32)
+        for i in numba.prange(count):
+            total = 0.0
+            for j in range(i * frame, (i + 1) * frame):
+                total += audio[j] * audio[j]
+            energies[i] = np.sqrt(total / frame)
+        return energies
+else:
+    def frame_energies(audio, frame):
+        """RMS energy of each complete frame of float32 audio."""
+        import numpy as np
+        count = len(audio) // frame
+        frames = np.asarray(audio[:count * frame], dtype=np.float32).reshape(count, frame)
+        return np.sqrt((frames * frames).mean(axis=1))
+
+def fadvise(fd, advice):
+    """Pass a page-cache hint for a whole file; a no-op where posix_fadvise is missing."""
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(fd, 0, 0, advice)
+        except OSError:
+            pass
+
+def read_multipart(rfile, length, boundary, file_fields, temp_dir):
+    """
+    Parse a multipart/form-data body from rfile without buffering it whole.
+    
+    The body is read MULTIPART_CHUNK_SIZE bytes at a time. Parts named in
+    file_fields are streamed into spooled temporary files and hashed with
+    SHA-256 on the way; other parts are decoded as short text values.
+    Returns (fields, files) where files maps a name to (file, digest, size).
+    """
+    remaining = length
+    buffer = b''
+    
+    def fill():
+        nonlocal remaining, buffer
+        if remaining <= 0:
+            return False
+        chunk = rfile.read(min(MULTIPART_CHUNK_SIZE, remaining))
+        if not chunk:
+            remaining = 0
+            return False
+        remaining -= len(chunk)
+        buffer += chunk
+        return True
+    
+    delimiter = b'--' + boundary
+    separator = b'\r\n' + delimiter
+    fields, files = {}, {}
+    target = None
+    
+    try:
+        # Skip the preamble up to the first delimiter
+        index = buffer.find(delimiter)
+        while index < 0:
+            if not fill():
+                raise ValueError("Malformed multipart body")
+            index = buffer.find(delimiter)
+        buffer = buffer[index + len(delimiter):]
+        
+        while True:
+            # After a delimiter, "--" ends the body and CRLF starts another part
+            while len(buffer) < 2:
+                if not fill():
+                    raise ValueError("Unexpected end of multipart body")
+            if buffer.startswith(b'--'):
+                break
+            
+            header_end = buffer.find(b'\r\n\r\n')
+            while header_end < 0:
+                if len(buffer) > MAX_FORM_FIELD_SIZE or not fill():
+                    raise ValueError("Malformed multipart headers")
+                header_end = buffer.find(b'\r\n\r\n')
+            # Only the part headers are parsed; the body bytes are never decoded
+            headers = BytesHeaderParser().parsebytes(buffer[2:header_end])
+            buffer = buffer[header_end + 4:]
+            
+            name = headers.get_param('name', header='content-disposition')
+            name = collapse_rfc2231_value(name) if name is not None else ''
+            is_file = name in file_fields
+            if is_file:
+                if length > UPLOAD_SPOOL_SIZE and os.name != 'nt':
+                    # Too big for the spool: a named file lets ffmpeg read it in place
+                    target = tempfile.NamedTemporaryFile(dir=temp_dir, suffix='.upload')
+                    fadvise(target.fileno(), getattr(os, 'POSIX_FADV_SEQUENTIAL', 0))
+                else:
+                    target = tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_SIZE, dir=temp_dir)
+                hasher = hashlib.sha256()
+            else:
+                target = io.BytesIO()
+            
+            # Stream the part body, holding back a tail that may start a split separator.
+            # The body bytes are written through a memoryview so they are not copied first.
+            while True:
+                index = buffer.find(separator)
+                if index >= 0:
+                    data, buffer = memoryview(buffer)[:index], buffer[index + len(separator):]
+                else:
+                    cut = max(len(buffer) - len(separator) + 1, 0)
+                    data, buffer = memoryview(buffer)[:cut], buffer[cut:]
+                
+                target.write(data)
+                if is_file:
+                    hasher.update(data)
+                elif target.tell() > MAX_FORM_FIELD_SIZE:
+                    raise ValueError(f"Form field '{name}' is too large")
+                
+                if index >= 0:
+                    break
+                if not fill():
+                    raise ValueError("Unexpected end of multipart body")
+            
+            if is_file:
+                size = target.tell()
+                target.seek(0)
+                files[name] = (target, hasher.hexdigest(), size)
+            else:
+                fields[name] = target.getvalue().decode('utf-8', errors='replace').strip()
+            target = None
+    except BaseException:
+        if target is not None:
+            target.close()
+        for upload, _, _ in files.values():
+            upload.close()
+        raise
+    
+    return fields, files
+
+def detect_audio_kind(header):
+    """Identify an audio container from its first 12 bytes; None if unrecognised."""
+    if header[:4] == b'RIFF' and header[8:12] == b'WAVE':
+        return 'wav'
+    if header[:3] == b'ID3' or (len(header) > 1 and header[0] == 0xFF and header[1] & 0xE0 == 0xE0):
+        return 'mpeg'  # MP3 with ID3 tag or a bare MPEG/ADTS frame
+    if header[:4] == b'OggS':
+        return 'ogg'
+    if header[:4] == b'fLaC':
+        return 'flac'
+    if header[:4] == b'\x1aE\xdf\xa3':
+        return 'webm'
+    if header[4:8] == b'ftyp':
+        return 'mp4'
+    return None
+
 class AudioToTextWebServer:
     """
     A web-based audio to text converter that uses the browser's built-in capabilities
@@ -27,7 +262,27 @@ class AudioToTextWebServer:
         self.port = port
         self.server = None
         self.html_content = self._get_html_content()
+        # Encode the page once; every GET / reuses these bytes
+        self.html_body = self.html_content.encode('utf-8')
+        self.html_etag = f'"{hashlib.blake2b(self.html_body).hexdigest()[:16]}"'
+        # Precompressed variants, picked per request from Accept-Encoding
+        self.html_encoded = {'gzip': gzip.compress(self.html_body, 9)}
+        try:
+            import brotli
+            self.html_encoded['br'] = brotli.compress(self.html_body, quality=11)
+        except ImportError:
+            pass
         self.processing_jobs = {}  # Store background processing jobs
+        self.job_events = {}  # Per-job latest-update slots for /api/events
+        self._jobs_lock = threading.Lock()  # Guards processing_jobs and job_events
+        self._jobs_changed = threading.Condition(self._jobs_lock)  # Wakes long-polling status requests
+        self._status_cache = {}  # Encoded /api/status bodies, dropped whenever a job changes
+        self._job_finished_at = {}  # Completion times of finished jobs, for the janitor
+        self.executor = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="job")
+        self.google_executor = ThreadPoolExecutor(max_workers=GOOGLE_WORKERS, thread_name_prefix="google")
+        self._job_slots = threading.BoundedSemaphore(MAX_PENDING_JOBS)
+        self.result_cache = OrderedDict()
+        self._result_cache_lock = threading.Lock()
         self.temp_dir = tempfile.mkdtemp()
         
         # Try to import speech recognition for background processing
@@ -38,21 +293,516 @@ class AudioToTextWebServer:
             import speech_recognition as sr
             self.sr = sr
             self.recognizer = sr.Recognizer()
+            # Fixed threshold: no per-job noise scan, and concurrent jobs never
+            # race on the shared recognizer's settings
+            self.recognizer.energy_threshold = 300
+            self.recognizer.dynamic_energy_threshold = False
+            self.recognizer.operation_timeout = GOOGLE_TIMEOUT
             self.speech_recognition_available = True
             print("✓ SpeechRecognition available for background processing")
         except ImportError:
             print("! SpeechRecognition not available - using browser-only mode")
         
+        # Prefer faster-whisper (CTranslate2); fall back to openai-whisper
+        self.faster_whisper = None
+        self.whisper = None
         try:
-            import whisper
-            self.whisper = whisper
+            import faster_whisper
+            self.faster_whisper = faster_whisper
             self.whisper_available = True
-            print("✓ Whisper available for background processing")
+            print("✓ faster-whisper available for background processing")
+        except ImportError:
+            try:
+                import whisper
+                self.whisper = whisper
+                self.whisper_available = True
+                print("✓ Whisper available for background processing")
+            except ImportError:
+                print("! Whisper not available - using browser-only mode")
+        
+        # Optional WebRTC VAD for splitting long uploads at silences
+        self.webrtcvad = None
+        try:
+            import webrtcvad
+            self.webrtcvad = webrtcvad
         except ImportError:
-            print("! Whisper not available - using browser-only mode")
+            pass
+        
+        # Pick the Whisper device once; COMPUTE_TYPE overrides the faster-whisper precision
+        self.device = self._detect_device()
+        self.compute_type = os.environ.get(
+            "COMPUTE_TYPE", "int8_float16" if self.device == "cuda" else "int8"
+        )
+        if self.whisper_available:
+            print(f"✓ Whisper using GPU: {self.device == 'cuda'}"
+                  + (f" ({self.compute_type})" if self.faster_whisper else ""))
+        
+        # Optional in-memory decoding of uploads for openai-whisper
+        self.soundfile = None
+        self.librosa = None
+        try:
+            import soundfile
+            self.soundfile = soundfile
+            import librosa
+            self.librosa = librosa
+        except ImportError:
+            pass
+        
+        # Loaded Whisper models by size, least recently used first; guarded by
+        # _model_lock so concurrent jobs never load the same model twice
+        self._models = OrderedDict()
+        self._model_lock = threading.Lock()
+        
+        # Single consumer that groups concurrent Whisper jobs into batches; audio is
+        # decoded on a separate CPU pool as soon as it is queued
+        self.whisper_queue = queue.Queue()
+        self.decode_pool = ThreadPoolExecutor(max_workers=DECODE_WORKERS, thread_name_prefix="decode")
+        if self.whisper_available:
+            threading.Thread(target=self._whisper_batcher, daemon=True).start()
+            # Load the shared model in the background so the first job does not pay for it
+            if os.environ.get("WHISPER_PRELOAD", "1") != "0":
+                threading.Thread(target=self._preload_whisper, daemon=True).start()
+        
+        threading.Thread(target=self._expire_jobs, daemon=True).start()
+    
+    def _detect_device(self):
+        """Return "cuda" when the active Whisper backend can use a GPU, else "cpu"."""
+        try:
+            if self.faster_whisper:
+                import ctranslate2
+                return "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+            if self.whisper:
+                import torch
+                return "cuda" if torch.cuda.is_available() else "cpu"
+        except ImportError:
+            pass
+        return "cpu"
+    
+    def _load_whisper(self, name):
+        """Load a Whisper model by size."""
+        logger.info("Loading Whisper model '%s'", name)
+        if self.faster_whisper:
+            options = {}
+            if self.device == "cpu":
+                # int8 kernels on half the logical cores avoids hyperthread oversubscription
+                options = {'cpu_threads': max(1, (os.cpu_count() or 2) // 2), 'num_workers': 1}
+            return self.faster_whisper.WhisperModel(
+                name, device=self.device, compute_type=self.compute_type, **options
+            )
+        model = self.whisper.load_model(name, device=self.device)
+        if self.device == "cpu":
+            # Decoding on CPU is bound by the Linear weights; int8 moves a quarter of the bytes
+            model = self._quantize_openai_model(model)
+        return model
+    
+    def _quantize_openai_model(self, model):
+        """
+        Dynamically quantize an openai-whisper model's Linear layers to int8.
+        
+        Its layers are whisper.model.Linear, and quantize_dynamic only swaps modules
+        whose exact type is nn.Linear, so they are turned into plain nn.Linear first;
+        on fp32 CPU inputs the two behave the same.
+        """
+        import torch
+        for module in model.modules():
+            if type(module) is self.whisper.model.Linear:
+                module.__class__ = torch.nn.Linear
+        quantized_model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        quantized = sum(isinstance(module, torch.ao.nn.quantized.dynamic.Linear)
+                        for module in quantized_model.modules())
+        if quantized == 0:
+            logger.warning("int8 quantization converted no Linear layers; using the fp32 model")
+            return model
+        logger.info("Quantized %d Linear layers to int8", quantized)
+        return quantized_model
+    
+    def _get_whisper_model(self, name=WHISPER_MODEL):
+        """Return the cached Whisper model for the given size, loading it on first use."""
+        with self._model_lock:
+            model = self._models.get(name)
+            if model is not None:
+                self._models.move_to_end(name)
+                return model
+            model = self._load_whisper(name)
+            self._models[name] = model
+            while len(self._models) > MODEL_CACHE_SIZE:
+                self._models.popitem(last=False)
+            return model
+    
+    def _preload_whisper(self):
+        """Load the default Whisper model into the cache at startup."""
+        try:
+            self._get_whisper_model()
+            logger.info("Whisper model '%s' loaded and ready", WHISPER_MODEL)
+        except Exception as e:
+            logger.warning("Could not preload Whisper model: %s", e)
+    
+    def release_models(self):
+        """Drop all cached Whisper models and return their memory."""
+        with self._model_lock:
+            self._models.clear()
+        gc.collect()
+        try:
+            import torch
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except ImportError:
+            pass
+        logger.info("Released cached Whisper models")
+    
+    def _transcribe_with_whisper(self, audio_file, language=None, on_partial=None):
+        """
+        Queue an uploaded audio file object for the Whisper batcher and wait for its text.
+        language is a code such as "en-US"; Whisper only uses the "en" part.
+        on_partial(text, fraction) is called as segments are decoded.
+        """
+        request = {'done': threading.Event(), 'text': None, 'error': None, 'on_partial': on_partial,
+                   'language': language.split('-')[0].lower() if language else None,
+                   'prepared': self.decode_pool.submit(self._prepare_whisper_input, audio_file)}
+        self.whisper_queue.put(request)
+        request['done'].wait()
+        if request['error'] is not None:
+            raise request['error']
+        return request['text']
+    
+    def _whisper_batcher(self):
+        """
+        Collect queued Whisper requests for BATCH_WAIT_SECONDS, or for as long as
+        the first request is still being decoded, and run them together.
+        """
+        while True:
+            batch = [self.whisper_queue.get()]
+            deadline = time.time() + BATCH_WAIT_SECONDS
+            while len(batch) < WHISPER_BATCH_SIZE:
+                # Time spent waiting on the first decode is free batching time
+                timeout = max(deadline - time.time(), 0)
+                if timeout == 0 and batch[0]['prepared'].done():
+                    break
+                try:
+                    batch.append(self.whisper_queue.get(timeout=timeout or 0.01))
+                except queue.Empty:
+                    pass
+            
+            try:
+                if self.faster_whisper:
+                    self._transcribe_batch_faster(batch)
+                else:
+                    self._transcribe_batch_openai(batch)
+            except Exception as e:
+                for request in batch:
+                    if request['error'] is None and request['text'] is None:
+                        request['error'] = e
+            finally:
+                for request in batch:
+                    request['done'].set()
+    
+    def _prepare_whisper_input(self, audio_file):
+        """
+        CPU side of a Whisper request, run on decode_pool so it overlaps with
+        the batch the model is currently working on. Returns the decoded
+        waveform for faster-whisper, or the chunk log-mel spectrograms for
+        openai-whisper.
+        """
+        if self.faster_whisper:
+            audio_file.seek(0)
+            return self.faster_whisper.decode_audio(audio_file)
+        
+        whisper = self.whisper
+        n_mels = self._get_whisper_model().dims.n_mels
+        audio = self._decode_audio(audio_file)
+        # On CUDA the STFT and mel filterbank run on the GPU, next to the encoder input
+        device = self.device if self.device == "cuda" else None
+        return [whisper.log_mel_spectrogram(whisper.pad_or_trim(audio[start:end]), n_mels, device=device)
+                for start, end in self._split_on_silence(audio, whisper.audio.SAMPLE_RATE)]
+    
+    def _transcribe_batch_faster(self, requests):
+        """Run each request through faster-whisper's batched pipeline."""
+        pipeline = self.faster_whisper.BatchedInferencePipeline(model=self._get_whisper_model())
+        for request in requests:
+            try:
+                audio = request['prepared'].result()
+                # Greedy decoding; the pipeline already skips silence with its own VAD
+                segments, info = pipeline.transcribe(
+                    audio, language=request['language'], batch_size=WHISPER_BATCH_SIZE, beam_size=1
+                )
+                text = io.StringIO()
+                last_partial = time.monotonic()
+                # segments is a generator; consume each one as it is decoded, but report
+                # progress at most every PARTIAL_INTERVAL_SECONDS so a long file's growing
+                # text is not copied into the job once per segment
+                for segment in segments:
+                    text.write(segment.text)
+                    now = time.monotonic()
+                    if (request['on_partial'] and info.duration
+                            and now - last_partial >= PARTIAL_INTERVAL_SECONDS):
+                        last_partial = now
+                        request['on_partial'](text.getvalue().strip(), segment.end / info.duration)
+                request['text'] = text.getvalue().strip()
+            except Exception as e:
+                request['error'] = e
+    
+    def _decode_audio(self, audio_file, sample_rate=16000):
+        """
+        Decode an uploaded file object to mono float32 at 16 kHz for openai-whisper.
+        Decodes in memory with soundfile when possible; formats it cannot read
+        go through a temp file and whisper's ffmpeg loader.
+        """
+        if self.soundfile is not None:
+            try:
+                audio_file.seek(0)
+                audio, rate = self.soundfile.read(audio_file, dtype="float32")
+                if audio.ndim > 1:
+                    audio = audio.mean(axis=1)
+                if rate != sample_rate:
+                    if self.librosa is None:
+                        raise ValueError(f"cannot resample {rate} Hz without librosa")
+                    audio = self.librosa.resample(audio, orig_sr=rate, target_sr=sample_rate)
+                return audio
+            except Exception:
+                pass
+        
+        # Large uploads were streamed to a named file; hand ffmpeg that path directly
+        path = getattr(audio_file, 'name', None)
+        if isinstance(path, str):
+            audio_file.flush()
+            return self.whisper.load_audio(path)
+        
+        fd, temp_file = tempfile.mkstemp(dir=self.temp_dir)
+        try:
+            audio_file.seek(0)
+            # Unbuffered writes of the upload's chunks; ffmpeg reads the file exactly once
+            for chunk in iter(lambda: audio_file.read(MULTIPART_CHUNK_SIZE), b''):
+                view = memoryview(chunk)
+                while view:
+                    view = view[os.write(fd, view):]
+            fadvise(fd, getattr(os, 'POSIX_FADV_SEQUENTIAL', 0))
+            return self.whisper.load_audio(temp_file)
+        finally:
+            fadvise(fd, getattr(os, 'POSIX_FADV_DONTNEED', 0))
+            os.close(fd)
+            os.remove(temp_file)
+    
+    def _split_on_silence(self, audio, sample_rate=16000):
+        """
+        Split 16 kHz float audio into (start, end) sample ranges of at most
+        VAD_MAX_CHUNK_SECONDS, cutting at the last silence of at least
+        VAD_MIN_SILENCE_MS. Uses WebRTC VAD when installed and frame energy
+        against VAD_ENERGY_THRESHOLD otherwise.
+        """
+        import numpy as np
+        max_samples = VAD_MAX_CHUNK_SECONDS * sample_rate
+        frame = sample_rate * VAD_FRAME_MS // 1000
+        
+        if self.webrtcvad is not None:
+            vad = self.webrtcvad.Vad(2)
+            pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+            speech = [vad.is_speech(pcm[end - frame:end].tobytes(), sample_rate)
+                      for end in range(frame, len(pcm) + 1, frame)]
+        else:
+            speech = frame_energies(np.ascontiguousarray(audio, dtype=np.float32), frame) >= VAD_ENERGY_THRESHOLD
+        
+        chunks = []
+        start = 0
+        last_cut = None
+        silent_ms = 0
+        for index, is_speech in enumerate(speech):
+            end = (index + 1) * frame
+            if is_speech:
+                silent_ms = 0
+            else:
+                silent_ms += VAD_FRAME_MS
+                if silent_ms >= VAD_MIN_SILENCE_MS:
+                    last_cut = end
+            
+            if end - start >= max_samples:
+                cut = last_cut if last_cut and last_cut > start else end
+                chunks.append((start, cut))
+                start = cut
+                last_cut = None
+        
+        if start < len(audio) or not chunks:
+            chunks.append((start, len(audio)))
+        return chunks
+    
+    def _transcribe_batch_openai(self, requests):
+        """
+        Transcribe several files with shared openai-whisper forward passes.
+        
+        Every file has been split at silences into chunks of up to 30 s by
+        _prepare_whisper_input; the log-mel spectrograms of all chunks of all
+        requests are stacked and
+        encoded WHISPER_BATCH_SIZE at a time, and the decoder then runs once
+        per batch. Chunk texts are merged back in order for each request.
+        """
+        import torch
+        whisper = self.whisper
+        model = self._get_whisper_model()
+        
+        mels, owners = [], []
+        for index, request in enumerate(requests):
+            try:
+                request_mels = request['prepared'].result()
+            except Exception as e:
+                request['error'] = e
+                continue
+            mels.extend(request_mels)
+            owners.extend([index] * len(request_mels))
+        
+        fp16 = model.device.type == "cuda"
+        dtype = torch.float16 if fp16 else torch.float32
+        
+        chunk_counts = [owners.count(index) for index in range(len(requests))]
+        texts = [[] for _ in requests]
+        for start in range(0, len(mels), WHISPER_BATCH_SIZE):
+            batch = torch.stack(mels[start:start + WHISPER_BATCH_SIZE]).to(model.device, dtype)
+            with torch.no_grad():
+                features = model.encoder(batch)
+            batch_owners = owners[start:start + WHISPER_BATCH_SIZE]
+            
+            # The encoder pass is shared; decoding runs once per language in the batch
+            results = [None] * len(batch_owners)
+            for language in {requests[owner]['language'] for owner in batch_owners}:
+                rows = [row for row, owner in enumerate(batch_owners) if requests[owner]['language'] == language]
+                options = whisper.DecodingOptions(language=language, fp16=fp16, without_timestamps=True)
+                # decode() skips the encoder when handed audio features
+                for row, result in zip(rows, whisper.decode(model, features[rows], options)):
+                    results[row] = result
+            
+            for owner, result in zip(batch_owners, results):
+                texts[owner].append(result.text.strip())
+            
+            for owner in set(batch_owners):
+                on_partial = requests[owner]['on_partial']
+                if on_partial:
+                    text = " ".join(part for part in texts[owner] if part)
+                    on_partial(text, len(texts[owner]) / chunk_counts[owner])
+        
+        for request, parts in zip(requests, texts):
+            if request['error'] is None:
+                request['text'] = " ".join(part for part in parts if part)
+    
+    def _create_job(self, job_id, info):
+        """Register a new job and its event queue."""
+        with self._jobs_lock:
+            # Each update is a full snapshot, so only the newest one needs keeping
+            self.job_events[job_id] = queue.Queue(maxsize=1)
+            self.processing_jobs[job_id] = info
+    
+    def _update_job(self, job_id, fields):
+        """Atomically update a job and push a snapshot of it to the job's event stream."""
+        with self._jobs_lock:
+            job = self.processing_jobs[job_id]
+            job.update(fields)
+            if fields.get('status') in ('completed', 'error'):
+                self._job_finished_at[job_id] = time.time()
+            self._status_cache.pop(job_id, None)
+            self._jobs_changed.notify_all()
+            events = self.job_events.get(job_id)
+            if events is not None:
+                # Replace an unread snapshot so memory stays flat without a subscriber
+                try:
+                    events.get_nowait()
+                except queue.Empty:
+                    pass
+                events.put_nowait(dict(job))
+    
+    def _wait_for_job_change(self, job_id, timeout):
+        """
+        Wait up to timeout seconds for an unfinished job to change and return
+        its snapshot, or None if the job does not exist.
+        """
+        with self._jobs_changed:
+            job = self.processing_jobs.get(job_id)
+            if job is None:
+                return None
+            before = dict(job)
+            if before.get('status') not in ('completed', 'error'):
+                self._jobs_changed.wait_for(lambda: job != before, timeout)
+            return dict(job)
+    
+    def _get_job_json(self, job_id):
+        """Return a job encoded as JSON, reusing the bytes until the job next changes."""
+        with self._jobs_lock:
+            body = self._status_cache.get(job_id)
+            if body is None:
+                job = self.processing_jobs.get(job_id)
+                if job is None:
+                    return None
+                body = self._status_cache[job_id] = encode_json(job)
+            return body
+    
+    def _get_job(self, job_id):
+        """Return a consistent copy of a job, or None if it does not exist."""
+        with self._jobs_lock:
+            job = self.processing_jobs.get(job_id)
+            return dict(job) if job is not None else None
+    
+    def _expire_jobs(self):
+        """Drop finished jobs older than JOB_TTL_SECONDS so a long-running server stays flat."""
+        while True:
+            time.sleep(JOB_SWEEP_SECONDS)
+            cutoff = time.time() - JOB_TTL_SECONDS
+            with self._jobs_lock:
+                expired = [job_id for job_id, finished in self._job_finished_at.items() if finished < cutoff]
+                for job_id in expired:
+                    del self._job_finished_at[job_id]
+                    self.processing_jobs.pop(job_id, None)
+                    self.job_events.pop(job_id, None)
+                    self._status_cache.pop(job_id, None)
+            if expired:
+                logger.debug("Expired %d finished jobs", len(expired))
+    
+    def _result_cache_key(self, audio_digest, engine, language):
+        """Combine the upload's SHA-256 with the settings that affect its transcription."""
+        model = WHISPER_MODEL if engine == 'whisper' else ''
+        return hashlib.sha256(f"{audio_digest}|{engine}|{language}|{model}".encode()).hexdigest()
+    
+    def _get_cached_result(self, key):
+        """Return a previous transcription for this key from memory or disk, or None."""
+        with self._result_cache_lock:
+            if key in self.result_cache:
+                self.result_cache.move_to_end(key)
+                return self.result_cache[key]
+        if RESULT_CACHE_DIR is None:
+            return None
+        path = RESULT_CACHE_DIR / f"{key}.txt"
+        try:
+            text = path.read_text(encoding='utf-8')
+            os.utime(path)  # Recently used files are pruned last
+        except OSError:
+            return None
+        self._store_cached_result(key, text, persist=False)
+        return text
+    
+    def _store_cached_result(self, key, text, persist=True):
+        """Remember a transcription, evicting the least recently used entry when full."""
+        with self._result_cache_lock:
+            self.result_cache[key] = text
+            self.result_cache.move_to_end(key)
+            while len(self.result_cache) > RESULT_CACHE_SIZE:
+                self.result_cache.popitem(last=False)
+        if persist and RESULT_CACHE_DIR is not None:
+            try:
+                RESULT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                (RESULT_CACHE_DIR / f"{key}.txt").write_text(text, encoding='utf-8')
+                self._prune_result_cache_dir()
+            except OSError as e:
+                logger.warning("Could not save transcription to cache: %s", e)
+    
+    def _prune_result_cache_dir(self):
+        """Delete the least recently used transcript files beyond RESULT_CACHE_FILES."""
+        files = sorted(RESULT_CACHE_DIR.glob("*.txt"), key=lambda path: path.stat().st_mtime)
+        for path in files[:max(len(files) - RESULT_CACHE_FILES, 0)]:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
     
     def cleanup(self):
         """Clean up temporary files and resources."""
+        self.executor.shutdown(wait=False)
+        self.google_executor.shutdown(wait=False)
+        self.decode_pool.shutdown(wait=False)
         try:
             if os.path.exists(self.temp_dir):
                 shutil.rmtree(self.temp_dir)
@@ -455,7 +1205,8 @@ class AudioToTextWebServer:
         const recordBtn = document.getElementById('recordBtn');
         const transcriptionText = document.getElementById('transcriptionText');
         
-        let pollInterval = null;
+        let eventSource = null;
+        let activeJobId = null;
         
         // Drag and drop
         uploadArea.addEventListener('dragover', (e) => {
@@ -578,23 +1329,26 @@ class AudioToTextWebServer:
             recognition.interimResults = true;
             recognition.lang = 'en-US';
             
-            let finalTranscript = '';
-            let interimTranscript = '';
+            // Collect final results in an array; joining once per event avoids
+            // re-copying an ever-growing string on long sessions
+            const finalParts = [];
             
             recognition.onresult = (event) => {
-                interimTranscript = '';
+                const interimParts = [];
                 
                 for (let i = event.resultIndex; i < event.results.length; i++) {
                     const transcript = event.results[i][0].transcript;
                     
                     if (event.results[i].isFinal) {
-                        finalTranscript += transcript + ' ';
+                        finalParts.push(transcript);
                     } else {
-                        interimTranscript += transcript;
+                        interimParts.push(transcript);
                     }
                 }
                 
-                transcriptionText.value = finalTranscript + interimTranscript;
+                const finalText = finalParts.join(' ');
+                const interimText = interimParts.join('');
+                transcriptionText.value = finalText && interimText ? finalText + ' ' + interimText : finalText + interimText;
             };
             
             recognition.onerror = (event) => {
@@ -603,7 +1357,7 @@ class AudioToTextWebServer:
             };
             
             recognition.onend = () => {
-                transcriptionText.value = finalTranscript;
+                transcriptionText.value = finalParts.join(' ');
                 showStatus('Transcription completed!', 'success');
                 transcribeBtn.disabled = false;
                 document.getElementById('downloadBtn').disabled = false;
@@ -658,7 +1412,8 @@ class AudioToTextWebServer:
                 });
                 
                 if (!response.ok) {
-                    throw new Error(`Server error: ${response.status}`);
+                    const detail = await response.json().catch(() => ({}));
+                    throw new Error(detail.error || `Server error: ${response.status}`);
                 }
                 
                 const result = await response.json();
@@ -667,8 +1422,8 @@ class AudioToTextWebServer:
                     const jobId = result.job_id;
                     showBackgroundProgress('Processing audio...', 25);
                     
-                    // Start polling for results
-                    pollForResults(jobId);
+                    // Stream results as the server produces them
+                    watchJobEvents(jobId);
                 } else {
                     throw new Error(result.error || 'Unknown error');
                 }
@@ -681,51 +1436,71 @@ class AudioToTextWebServer:
             }
         }
         
-        // Poll server for transcription results
-        async function pollForResults(jobId) {
-            let progress = 25;
+        // Apply a job update; returns true once the job has finished
+        function handleJobUpdate(result) {
+            if (result.status === 'completed') {
+                hideBackgroundProgress();
+                
+                if (result.success) {
+                    transcriptionText.value = result.text;
+                    showStatus('Background transcription completed successfully!', 'success');
+                    document.getElementById('downloadBtn').disabled = false;
+                } else {
+                    showStatus(`Transcription failed: ${result.error}`, 'error');
+                }
+                
+                backgroundTranscribeBtn.disabled = false;
+                transcribeBtn.disabled = false;
+                return true;
+                
+            } else if (result.status === 'error') {
+                hideBackgroundProgress();
+                showStatus(`Transcription failed: ${result.error}`, 'error');
+                backgroundTranscribeBtn.disabled = false;
+                transcribeBtn.disabled = false;
+                return true;
+            }
             
-            pollInterval = setInterval(async () => {
-                try {
-                    const response = await fetch(`/api/status/${jobId}`);
-                    const result = await response.json();
-                    
-                    if (result.status === 'completed') {
-                        clearInterval(pollInterval);
-                        hideBackgroundProgress();
-                        
-                        if (result.success) {
-                            transcriptionText.value = result.text;
-                            showStatus('Background transcription completed successfully!', 'success');
-                            document.getElementById('downloadBtn').disabled = false;
-                        } else {
-                            showStatus(`Transcription failed: ${result.error}`, 'error');
-                        }
-                        
-                        backgroundTranscribeBtn.disabled = false;
-                        transcribeBtn.disabled = false;
-                        
-                    } else if (result.status === 'error') {
-                        clearInterval(pollInterval);
-                        hideBackgroundProgress();
-                        showStatus(`Transcription failed: ${result.error}`, 'error');
-                        backgroundTranscribeBtn.disabled = false;
-                        transcribeBtn.disabled = false;
-                        
-                    } else {
-                        // Still processing
-                        progress = Math.min(progress + 5, 90);
-                        showBackgroundProgress('Processing audio...', progress);
+            // Still processing - show partial text as segments arrive
+            if (result.partial_text) {
+                transcriptionText.value = result.partial_text;
+            }
+            showBackgroundProgress('Processing audio...', result.progress || 25);
+            return false;
+        }
+        
+        // Receive progress and results over Server-Sent Events
+        function watchJobEvents(jobId) {
+            activeJobId = jobId;
+            eventSource = new EventSource(`/api/events/${jobId}`);
+            
+            eventSource.onmessage = (event) => {
+                handleJobUpdate(JSON.parse(event.data));
+            };
+            
+            eventSource.onerror = () => {
+                // Event stream unavailable (e.g. behind a buffering proxy) - long-poll instead
+                eventSource.close();
+                eventSource = null;
+                waitForResults(jobId);
+            };
+        }
+        
+        // Long-poll the status endpoint; the server answers when the job changes
+        async function waitForResults(jobId) {
+            try {
+                while (activeJobId === jobId) {
+                    const response = await fetch(`/api/status/${jobId}?wait=25`);
+                    if (handleJobUpdate(await response.json())) {
+                        break;
                     }
-                    
-                } catch (error) {
-                    clearInterval(pollInterval);
-                    hideBackgroundProgress();
-                    showStatus(`Error checking transcription status: ${error.message}`, 'error');
-                    backgroundTranscribeBtn.disabled = false;
-                    transcribeBtn.disabled = false;
                 }
-            }, 2000); // Poll every 2 seconds
+            } catch (error) {
+                hideBackgroundProgress();
+                showStatus(`Error checking transcription status: ${error.message}`, 'error');
+                backgroundTranscribeBtn.disabled = false;
+                transcribeBtn.disabled = false;
+            }
         }
         
         // Show background processing progress
@@ -743,10 +1518,11 @@ class AudioToTextWebServer:
         function hideBackgroundProgress() {
             const backgroundStatus = document.getElementById('backgroundStatus');
             backgroundStatus.style.display = 'none';
+            activeJobId = null;
             
-            if (pollInterval) {
-                clearInterval(pollInterval);
-                pollInterval = null;
+            if (eventSource) {
+                eventSource.close();
+                eventSource = null;
             }
         }
         
@@ -799,7 +1575,31 @@ class AudioToTextWebServer:
         // Initialize
         document.addEventListener('DOMContentLoaded', () => {
             showStatus('Audio to Text Converter loaded successfully!', 'success');
+            loadServerConfig();
         });
+        
+        // Disable engines the server cannot run and show where Whisper runs
+        async function loadServerConfig() {
+            try {
+                const response = await fetch('/api/config');
+                const config = await response.json();
+                
+                for (const [engine, available] of Object.entries(config.engines)) {
+                    const input = document.getElementById(`${engine}Engine`);
+                    input.disabled = !available;
+                    if (!available && input.checked) {
+                        document.getElementById('browserEngine').checked = true;
+                    }
+                }
+                
+                if (config.engines.whisper) {
+                    const label = document.querySelector('label[for="whisperEngine"]');
+                    label.textContent = `OpenAI Whisper (Offline, ${config.device.toUpperCase()})`;
+                }
+            } catch (error) {
+                console.warn('Could not load server configuration:', error);
+            }
+        }
     </script>
 </body>
 </html>
@@ -809,14 +1609,19 @@ class AudioToTextWebServer:
         """Start the web server."""
         handler = self._create_handler()
         
+        _log_listener.start()
         try:
-            self.server = socketserver.TCPServer(("", self.port), handler)
+            # One thread per connection so uploads, event streams and page loads
+            # run concurrently; HTTPServer already binds with allow_reuse_address
+            self.server = http.server.ThreadingHTTPServer(("", self.port), handler)
+            self.server.daemon_threads = True
             print(f"Audio to Text Converter started!")
             print(f"Open your browser and go to: http://localhost:{self.port}")
             print("Press Ctrl+C to stop the server")
             
-            # Automatically open browser
-            threading.Timer(1.0, lambda: webbrowser.open(f"http://localhost:{self.port}")).start()
+            # The socket is already listening, so the browser's request just
+            # waits in the backlog until serve_forever() picks it up
+            webbrowser.open(f"http://localhost:{self.port}")
             
             self.server.serve_forever()
             
@@ -826,44 +1631,57 @@ class AudioToTextWebServer:
             print(f"Error starting server: {e}")
         finally:
             if self.server:
-                self.server.shutdown()
+                self.server.server_close()
             self.cleanup()
+            _log_listener.stop()
     
-    def _process_audio_background(self, job_id, audio_data, engine, language):
-        """Process audio in background thread."""
+    def _process_audio_background(self, job_id, audio_file, audio_digest, engine, language):
+        """Process an uploaded audio file object in a background thread."""
         try:
-            print(f"Starting background processing for job {job_id} with engine {engine}")
+            logger.info("Starting background processing for job %s with engine %s", job_id, engine)
             
-            # Save audio data to temporary file
-            temp_file = os.path.join(self.temp_dir, f"{job_id}.wav")
-            with open(temp_file, 'wb') as f:
-                f.write(audio_data)
+            self._update_job(job_id, {'status': 'processing', 'progress': 50})
             
-            print(f"Audio data saved to {temp_file}, size: {len(audio_data)} bytes")
-            
-            self.processing_jobs[job_id]['status'] = 'processing'
-            self.processing_jobs[job_id]['progress'] = 50
+            # Identical uploads with the same settings reuse the earlier result
+            cache_key = self._result_cache_key(audio_digest, engine, language)
+            cached_text = self._get_cached_result(cache_key)
+            if cached_text is not None:
+                logger.info("Using cached transcription for job %s", job_id)
+                self._update_job(job_id, {
+                    'status': 'completed',
+                    'success': True,
+                    'text': cached_text,
+                    'progress': 100,
+                    'cached': True
+                })
+                return
             
             # Process based on engine
             if engine == 'whisper' and self.whisper_available:
                 try:
-                    print(f"Loading Whisper model for job {job_id}")
-                    model = self.whisper.load_model("base")
-                    print(f"Transcribing with Whisper for job {job_id}")
-                    result = model.transcribe(temp_file)
-                    text = result["text"].strip()
+                    logger.info("Transcribing with Whisper for job %s", job_id)
+                    
+                    def on_partial(partial_text, fraction):
+                        self._update_job(job_id, {
+                            'partial_text': partial_text,
+                            'progress': 50 + int(45 * min(fraction, 1.0))
+                        })
                     
-                    print(f"Whisper transcription completed for job {job_id}: {text[:100]}...")
+                    text = self._transcribe_with_whisper(audio_file, language, on_partial)
                     
-                    self.processing_jobs[job_id].update({
+                    logger.info("Whisper transcription completed for job %s", job_id)
+                    logger.debug("Job %s text: %.100s...", job_id, text)
+                    self._store_cached_result(cache_key, text)
+                    
+                    self._update_job(job_id, {
                         'status': 'completed',
                         'success': True,
                         'text': text,
                         'progress': 100
                     })
                 except Exception as e:
-                    print(f"Whisper error for job {job_id}: {str(e)}")
-                    self.processing_jobs[job_id].update({
+                    logger.error("Whisper error for job %s: %s", job_id, e)
+                    self._update_job(job_id, {
                         'status': 'error',
                         'success': False,
                         'error': f"Whisper processing failed: {str(e)}"
@@ -871,37 +1689,39 @@ class AudioToTextWebServer:
             
             elif engine == 'google' and self.speech_recognition_available:
                 try:
-                    print(f"Processing with Google Speech Recognition for job {job_id}")
-                    with self.sr.AudioFile(temp_file) as source:
-                        self.recognizer.adjust_for_ambient_noise(source)
+                    logger.info("Processing with Google Speech Recognition for job %s", job_id)
+                    audio_file.seek(0)
+                    with self.sr.AudioFile(audio_file) as source:
                         audio = self.recognizer.record(source)
                     
                     text = self.recognizer.recognize_google(audio, language=language)
-                    print(f"Google transcription completed for job {job_id}: {text[:100]}...")
+                    logger.info("Google transcription completed for job %s", job_id)
+                    logger.debug("Job %s text: %.100s...", job_id, text)
+                    self._store_cached_result(cache_key, text)
                     
-                    self.processing_jobs[job_id].update({
+                    self._update_job(job_id, {
                         'status': 'completed',
                         'success': True,
                         'text': text,
                         'progress': 100
                     })
                 except self.sr.UnknownValueError:
-                    print(f"Google Speech Recognition could not understand audio for job {job_id}")
-                    self.processing_jobs[job_id].update({
+                    logger.info("Google Speech Recognition could not understand audio for job %s", job_id)
+                    self._update_job(job_id, {
                         'status': 'completed',
                         'success': False,
                         'error': "Could not understand audio - try speaking more clearly or use a different audio file"
                     })
                 except self.sr.RequestError as e:
-                    print(f"Google Speech Recognition error for job {job_id}: {str(e)}")
-                    self.processing_jobs[job_id].update({
+                    logger.error("Google Speech Recognition error for job %s: %s", job_id, e)
+                    self._update_job(job_id, {
                         'status': 'error',
                         'success': False,
                         'error': f"Google Speech Recognition error: {str(e)}"
                     })
                 except Exception as e:
-                    print(f"Google processing error for job {job_id}: {str(e)}")
-                    self.processing_jobs[job_id].update({
+                    logger.error("Google processing error for job %s: %s", job_id, e)
+                    self._update_job(job_id, {
                         'status': 'error',
                         'success': False,
                         'error': f"Processing failed: {str(e)}"
@@ -909,66 +1729,163 @@ class AudioToTextWebServer:
             
             else:
                 error_msg = f"Engine '{engine}' not available. Available engines: {', '.join([e for e, a in [('google', self.speech_recognition_available), ('whisper', self.whisper_available)] if a])}"
-                print(f"Engine error for job {job_id}: {error_msg}")
-                self.processing_jobs[job_id].update({
+                logger.warning("Engine error for job %s: %s", job_id, error_msg)
+                self._update_job(job_id, {
                     'status': 'error',
                     'success': False,
                     'error': error_msg
                 })
-            
-            # Clean up temporary file
-            try:
-                os.remove(temp_file)
-                print(f"Cleaned up temp file for job {job_id}")
-            except Exception as e:
-                print(f"Warning: Could not clean up temp file for job {job_id}: {e}")
                 
         except Exception as e:
-            print(f"Unexpected error in background processing for job {job_id}: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            self.processing_jobs[job_id].update({
+            logger.exception("Unexpected error in background processing for job %s", job_id)
+            self._update_job(job_id, {
                 'status': 'error',
                 'success': False,
                 'error': f"Unexpected error: {str(e)}"
             })
+        finally:
+            # Uploads streamed to a named file are read once; drop their cached pages
+            if isinstance(getattr(audio_file, 'name', None), str):
+                fadvise(audio_file.fileno(), getattr(os, 'POSIX_FADV_DONTNEED', 0))
+            audio_file.close()
+            self._job_slots.release()
+    
     def _create_handler(self):
         """Create the HTTP request handler."""
-        html_content = self.html_content
+        html_body = self.html_body
+        html_etag = self.html_etag
+        html_encoded = self.html_encoded
         server_instance = self
         
-        class AudioToTextHandler(http.server.SimpleHTTPRequestHandler):
+        class AudioToTextHandler(http.server.BaseHTTPRequestHandler):
+            # Keep-alive lets the page and its status polls reuse one connection;
+            # idle connections are dropped after a minute, beyond the longest long-poll
+            protocol_version = 'HTTP/1.1'
+            timeout = 60
+            
             def do_GET(self):
                 if self.path == '/' or self.path == '':
+                    if self.headers.get('If-None-Match') == html_etag:
+                        self.send_response(304)
+                        self.send_header('ETag', html_etag)
+                        self.end_headers()
+                        return
+                    
+                    accept_encoding = self.headers.get('Accept-Encoding', '')
+                    encoding = next(
+                        (name for name in ('br', 'gzip') if name in html_encoded and name in accept_encoding),
+                        None
+                    )
+                    body = html_encoded[encoding] if encoding else html_body
+                    
                     self.send_response(200)
-                    self.send_header('Content-type', 'text/html')
+                    self.send_header('Content-type', 'text/html; charset=utf-8')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.send_header('Cache-Control', 'public, max-age=3600')
+                    self.send_header('Vary', 'Accept-Encoding')
+                    self.send_header('ETag', html_etag)
+                    if encoding:
+                        self.send_header('Content-Encoding', encoding)
                     self.end_headers()
-                    self.wfile.write(html_content.encode())
+                    self.wfile.write(body)
                     
                 elif self.path.startswith('/api/status/'):
-                    # Get job status
-                    job_id = self.path.split('/')[-1]
+                    # Get job status; ?wait=N holds the request until the job changes
+                    url = urlparse(self.path)
+                    job_id = url.path.split('/')[-1]
+                    try:
+                        wait = min(float(parse_qs(url.query).get('wait', ['0'])[0]), 30.0)
+                    except ValueError:
+                        wait = 0
                     
-                    if job_id in server_instance.processing_jobs:
-                        job_info = server_instance.processing_jobs[job_id]
-                        response = json.dumps(job_info)
-                    else:
-                        response = json.dumps({
-                            'status': 'error',
-                            'error': 'Job not found'
-                        })
+                    if wait > 0:
+                        server_instance._wait_for_job_change(job_id, wait)
+                    response = server_instance._get_job_json(job_id) or JOB_NOT_FOUND
+                    
+                    self.send_response(200)
+                    self.send_header('Content-type', 'application/json')
+                    self.send_header('Content-Length', str(len(response)))
+                    self.send_header('Access-Control-Allow-Origin', '*')
+                    self.end_headers()
+                    self.wfile.write(response)
+                
+                elif self.path == '/api/config':
+                    # Lets the page enable only the engines this server can run
+                    response = encode_json({
+                        'engines': {
+                            'google': server_instance.speech_recognition_available,
+                            'whisper': server_instance.whisper_available
+                        },
+                        'whisper_backend': 'faster-whisper' if server_instance.faster_whisper else 'openai-whisper',
+                        'device': server_instance.device,
+                        'compute_type': server_instance.compute_type
+                    })
                     
                     self.send_response(200)
                     self.send_header('Content-type', 'application/json')
+                    self.send_header('Content-Length', str(len(response)))
                     self.send_header('Access-Control-Allow-Origin', '*')
                     self.end_headers()
-                    self.wfile.write(response.encode())
+                    self.wfile.write(response)
+                
+                elif self.path.startswith('/api/events/'):
+                    self._stream_job_events(self.path.split('/')[-1])
                     
                 else:
-                    super().do_GET()
+                    self.send_error(404)
+            
+            def _stream_job_events(self, job_id):
+                """Send job updates as Server-Sent Events until the job finishes."""
+                with server_instance._jobs_lock:
+                    events = server_instance.job_events.get(job_id)
+                
+                self.send_response(200)
+                self.send_header('Content-type', 'text/event-stream')
+                self.send_header('Cache-Control', 'no-cache')
+                self.send_header('Connection', 'close')
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.end_headers()
+                
+                if events is None:
+                    job = {'status': 'error', 'error': 'Job not found'}
+                else:
+                    # Skip updates queued before we connected and start from the current state
+                    while not events.empty():
+                        events.get_nowait()
+                    job = server_instance._get_job(job_id)
+                
+                try:
+                    while True:
+                        self.wfile.write(b"data: " + encode_json(job) + b"\n\n")
+                        self.wfile.flush()
+                        if job.get('status') in ('completed', 'error'):
+                            break
+                        try:
+                            job = events.get(timeout=15)
+                        except queue.Empty:
+                            # Resend the current state so idle streams stay open
+                            job = server_instance._get_job(job_id)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
             
             def do_POST(self):
-                if self.path == '/api/transcribe':
+                if self.path == '/api/gc':
+                    # Free cached models, e.g. before switching model sizes. Local
+                    # callers only, since it stalls every queued job behind a reload
+                    if self.client_address[0] not in ('127.0.0.1', '::1'):
+                        self.send_error(403, "Only allowed from localhost")
+                        return
+                    server_instance.release_models()
+                    response = encode_json({'success': True, 'message': 'Model cache cleared'})
+                    
+                    self.send_response(200)
+                    self.send_header('Content-type', 'application/json')
+                    self.send_header('Content-Length', str(len(response)))
+                    self.send_header('Access-Control-Allow-Origin', '*')
+                    self.end_headers()
+                    self.wfile.write(response)
+                
+                elif self.path == '/api/transcribe':
                     try:
                         # Parse multipart form data
                         content_type = self.headers.get('content-type', '')
@@ -982,88 +1899,83 @@ class AudioToTextWebServer:
                             self.send_error(400, "No content received")
                             return
                         
-                        # Read the form data
-                        form_data = self.rfile.read(content_length)
-                        
                         # Parse boundary
                         boundary_match = content_type.split('boundary=')
                         if len(boundary_match) < 2:
                             self.send_error(400, "No boundary in content-type")
                             return
                         
-                        boundary = boundary_match[1].split(';')[0].strip()
+                        boundary = boundary_match[1].split(';')[0].strip().strip('"')
                         boundary = boundary.encode()
                         
-                        # Split by boundary
-                        parts = form_data.split(b'--' + boundary)
+                        # Stream the body; the audio part goes to a spooled temp file
+                        fields, files = read_multipart(
+                            self.rfile, content_length, boundary, {'audio'}, server_instance.temp_dir
+                        )
+                        engine = fields.get('engine') or 'google'
+                        language = fields.get('language') or 'en-US'
                         
-                        audio_data = None
-                        engine = 'google'
-                        language = 'en-US'
+                        if 'audio' not in files or files['audio'][2] < 100:
+                            for upload, _, _ in files.values():
+                                upload.close()
+                            raise ValueError("No valid audio data received")
+                        audio_file, audio_digest, audio_size = files['audio']
                         
-                        for part in parts:
-                            if len(part) < 10:  # Skip empty parts
-                                continue
-                                
-                            part_str = part.decode('utf-8', errors='ignore')
-                            
-                            if 'name="audio"' in part_str:
-                                # Find the start of binary data
-                                header_end = part.find(b'\r\n\r\n')
-                                if header_end == -1:
-                                    header_end = part.find(b'\n\n')
-                                    if header_end != -1:
-                                        header_end += 2
-                                else:
-                                    header_end += 4
-                                
-                                if header_end > 0:
-                                    audio_data = part[header_end:].rstrip(b'\r\n').rstrip(b'\n')
-                                    # Remove trailing boundary markers
-                                    if audio_data.endswith(b'--'):
-                                        audio_data = audio_data[:-2].rstrip(b'\r\n')
-                            
-                            elif 'name="engine"' in part_str:
-                                # Extract engine value
-                                lines = part_str.split('\n')
-                                for i, line in enumerate(lines):
-                                    if line.strip() == '' and i < len(lines) - 1:
-                                        engine = lines[i + 1].strip()
-                                        break
-                            
-                            elif 'name="language"' in part_str:
-                                # Extract language value
-                                lines = part_str.split('\n')
-                                for i, line in enumerate(lines):
-                                    if line.strip() == '' and i < len(lines) - 1:
-                                        language = lines[i + 1].strip()
-                                        break
+                        # Refuse non-audio uploads before a job or model is touched
+                        audio_kind = detect_audio_kind(audio_file.read(12))
+                        audio_file.seek(0)
+                        if audio_kind is None:
+                            audio_file.close()
+                            response = encode_json({
+                                'success': False,
+                                'error': 'Unsupported file type - upload WAV, MP3, OGG, FLAC, WebM or M4A audio'
+                            })
+                            self.send_response(415)
+                            self.send_header('Content-type', 'application/json')
+                            self.send_header('Content-Length', str(len(response)))
+                            self.send_header('Access-Control-Allow-Origin', '*')
+                            self.end_headers()
+                            self.wfile.write(response)
+                            return
+                        logger.info("Received %d bytes of %s audio", audio_size, audio_kind)
                         
-                        if not audio_data or len(audio_data) < 100:
-                            raise ValueError("No valid audio data received")
+                        # Each unfinished job holds a slot until _process_audio_background ends
+                        if not server_instance._job_slots.acquire(blocking=False):
+                            audio_file.close()
+                            response = encode_json({
+                                'success': False,
+                                'error': 'Server is busy - please try again shortly'
+                            })
+                            self.send_response(503)
+                            self.send_header('Content-type', 'application/json')
+                            self.send_header('Content-Length', str(len(response)))
+                            self.send_header('Retry-After', '5')
+                            self.send_header('Access-Control-Allow-Origin', '*')
+                            self.end_headers()
+                            self.wfile.write(response)
+                            return
                         
                         # Create job ID
-                        job_id = str(uuid.uuid4())
+                        job_id = secrets.token_urlsafe(9)
                         
                         # Initialize job
-                        server_instance.processing_jobs[job_id] = {
+                        server_instance._create_job(job_id, {
                             'status': 'queued',
                             'progress': 0,
                             'engine': engine,
                             'language': language,
                             'created_at': time.time()
-                        }
+                        })
                         
-                        # Start processing in background
-                        thread = threading.Thread(
-                            target=server_instance._process_audio_background,
-                            args=(job_id, audio_data, engine, language)
+                        # Start processing; Google round-trips must not hold Whisper job workers
+                        pool = server_instance.google_executor if engine == 'google' else server_instance.executor
+                        pool.submit(
+                            server_instance._process_audio_background,
+                            job_id, audio_file, audio_digest, engine, language
                         )
-                        thread.daemon = True
-                        thread.start()
                         
                         # Return job ID
-                        response = json.dumps({
+                        response = encode_json({
                             'success': True,
                             'job_id': job_id,
                             'message': 'Processing started'
@@ -1071,26 +1983,28 @@ class AudioToTextWebServer:
                         
                         self.send_response(200)
                         self.send_header('Content-type', 'application/json')
+                        self.send_header('Content-Length', str(len(response)))
                         self.send_header('Access-Control-Allow-Origin', '*')
                         self.end_headers()
-                        self.wfile.write(response.encode())
+                        self.wfile.write(response)
                         
                     except Exception as e:
                         # Log the full error for debugging
-                        print(f"Error in /api/transcribe: {str(e)}")
-                        import traceback
-                        traceback.print_exc()
+                        logger.exception("Error in /api/transcribe")
                         
-                        error_response = json.dumps({
+                        error_response = encode_json({
                             'success': False,
                             'error': str(e)
                         })
                         
+                        # The body may be partly unread, so this connection cannot be reused
+                        self.close_connection = True
                         self.send_response(500)
                         self.send_header('Content-type', 'application/json')
+                        self.send_header('Content-Length', str(len(error_response)))
                         self.send_header('Access-Control-Allow-Origin', '*')
                         self.end_headers()
-                        self.wfile.write(error_response.encode())
+                        self.wfile.write(error_response)
                 
                 else:
                     self.send_error(404)
@@ -1101,12 +2015,15 @@ class AudioToTextWebServer:
                 self.send_header('Access-Control-Allow-Origin', '*')
                 self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
                 self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+                self.send_header('Content-Length', '0')
                 self.end_headers()
             
             def log_message(self, format, *args):
-                # Suppress default logging except for errors
-                if 'POST /api/' in format % args or 'GET /api/' in format % args:
-                    print(f"API: {format % args}")
+                # Only API requests are logged, at debug level
+                if logger.isEnabledFor(logging.DEBUG):
+                    message = format % args
+                    if 'POST /api/' in message or 'GET /api/' in message:
+                        logger.debug("API: %s", message)
         
         return AudioToTextHandler
 
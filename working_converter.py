@@ -3,29 +3,280 @@ Simple Audio to Text Converter - File Upload Only
 Clean, working version focused on file upload and background conversion
 """
 
+import gzip
 import json
-import base64
 import threading
 import time
 import os
 import tempfile
-import traceback
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from urllib.parse import urlparse, parse_qs
+import logging
+import logging.handlers
+import queue
+import sys
+import hashlib
+import mmap
+import wave
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs, unquote
 
-# Try to import Whisper
+# Optional fast JSON encoder for the status endpoints; falls back to the standard library
 try:
-    import whisper
-    WHISPER_AVAILABLE = True
-    print("✓ Whisper loaded successfully")
+    import orjson
+    
+    def encode_json(obj):
+        return orjson.dumps(obj)
+except ImportError:
+    def encode_json(obj):
+        return json.dumps(obj).encode()
+
+# Request and job logs go through a queue so worker threads never block on the console;
+# the listener is started by main(). LOG_LEVEL=DEBUG also shows per-job steps.
+logger = logging.getLogger("working_converter")
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO").upper())
+logger.propagate = False
+_log_queue = queue.Queue(-1)
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+_log_handler = logging.StreamHandler(sys.stdout)
+_log_handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_handler)
+
+# One inference thread per physical core; SMT siblings only contend for the same FPUs
+try:
+    import psutil
+    CPU_THREADS = psutil.cpu_count(logical=False) or 1
 except ImportError:
-    WHISPER_AVAILABLE = False
-    print("❌ Whisper not available")
+    CPU_THREADS = max(1, (os.cpu_count() or 2) // 2)
+# BLAS backends read this when torch is first imported by whisper
+os.environ.setdefault("OMP_NUM_THREADS", str(CPU_THREADS))
 
-# Global variables for managing transcription jobs
-transcription_jobs = {}
+# WHISPER_BACKEND=onnx runs an ONNX export (see QUICKSTART.md) on ONNX Runtime;
+# otherwise prefer faster-whisper (CTranslate2 with int8 kernels), then openai-whisper
+WHISPER_ONNX_MODEL = os.environ.get("WHISPER_ONNX_MODEL", "whisper_base_onnx")
+ONNX_WHISPER = False
+if os.environ.get("WHISPER_BACKEND", "").lower() == "onnx":
+    try:
+        import onnxruntime
+        from optimum.onnxruntime import ORTModelForSpeechSeq2Seq
+        from transformers import AutoProcessor, pipeline
+        ONNX_WHISPER = True
+        print("✓ ONNX Runtime Whisper loaded successfully")
+    except ImportError:
+        print("! WHISPER_BACKEND=onnx needs: pip install optimum[onnxruntime]")
+
+if ONNX_WHISPER:
+    FASTER_WHISPER = False
+    WHISPER_AVAILABLE = True
+else:
+    try:
+        from faster_whisper import WhisperModel
+        try:
+            from faster_whisper import BatchedInferencePipeline
+        except ImportError:  # faster-whisper before 1.1
+            BatchedInferencePipeline = None
+        FASTER_WHISPER = True
+        WHISPER_AVAILABLE = True
+        print("✓ faster-whisper loaded successfully")
+    except ImportError:
+        FASTER_WHISPER = False
+        try:
+            import whisper
+            WHISPER_AVAILABLE = True
+            print("✓ Whisper loaded successfully")
+        except ImportError:
+            WHISPER_AVAILABLE = False
+            print("❌ Whisper not available")
+
+# Upload extensions passed through to the temp file so ffmpeg can pick the right demuxer
+ALLOWED_EXTENSIONS = frozenset({'.mp3', '.wav', '.flac', '.m4a', '.ogg', '.webm'})
+
+# Global variables for managing transcription jobs; finished jobs are kept in
+# completion order and dropped beyond MAX_FINISHED_JOBS or after JOB_TTL_SECONDS
+transcription_jobs = OrderedDict()
+MAX_FINISHED_JOBS = 512
+JOB_TTL_SECONDS = 3600
 job_counter = 0
-job_lock = threading.Lock()
+job_lock = threading.RLock()  # Reentrant so job_snapshot can run inside job_changed waits
+job_changed = threading.Condition(job_lock)  # Notified whenever a job is updated
+
+def update_job(job_id, **fields):
+    """Apply several fields to a job at once and wake any event streams waiting on it."""
+    with job_changed:
+        job = transcription_jobs[job_id]
+        job.update(fields)
+        if fields.get('status') in ('completed', 'error'):
+            job['completed_at'] = time.time()
+            transcription_jobs.move_to_end(job_id)
+            finished = [key for key, value in transcription_jobs.items() if 'completed_at' in value]
+            for key in finished[:len(finished) - MAX_FINISHED_JOBS]:
+                del transcription_jobs[key]
+        job_changed.notify_all()
+
+# Transcripts of recent uploads by BLAKE2b digest, so re-uploads of the same file are instant
+result_cache = OrderedDict()
+RESULT_CACHE_SIZE = 128
+
+def get_cached_result(digest):
+    """Return the transcript of an earlier identical upload, or None."""
+    with job_lock:
+        if digest in result_cache:
+            result_cache.move_to_end(digest)
+            return result_cache[digest]
+        return None
+
+def store_cached_result(digest, text):
+    """Remember a transcript, dropping the least recently used beyond RESULT_CACHE_SIZE."""
+    with job_lock:
+        result_cache[digest] = text
+        result_cache.move_to_end(digest)
+        while len(result_cache) > RESULT_CACHE_SIZE:
+            result_cache.popitem(last=False)
+
+def expire_jobs():
+    """Background sweep that forgets finished jobs older than JOB_TTL_SECONDS."""
+    while True:
+        time.sleep(60)
+        cutoff = time.time() - JOB_TTL_SECONDS
+        with job_lock:
+            for key in [key for key, value in transcription_jobs.items() if value.get('completed_at', cutoff) < cutoff]:
+                del transcription_jobs[key]
+
+def job_snapshot(job_id):
+    """Return the public view of a job, or a not_found status."""
+    with job_lock:
+        job = transcription_jobs.get(job_id) if job_id else None
+        if job is None:
+            return {'status': 'not_found', 'error': 'Job not found'}
+        progress = job.get('progress', 0)
+        if job['status'] == 'processing' and 'started_at' in job:
+            # Inference reports nothing until it ends, so progress is elapsed time over the estimate
+            elapsed = time.monotonic() - job['started_at']
+            progress = min(95, int(elapsed / max(job['expected_seconds'], 1.0) * 100))
+        return {
+            'status': job['status'],
+            'progress': progress,
+            'result': job.get('result', ''),
+            'error': job.get('error', '')
+        }
+
+# Fixed pool of transcription workers; extra uploads wait in its queue instead of
+# piling more concurrent jobs onto the CPU
+job_executor = ThreadPoolExecutor(max_workers=max(1, (os.cpu_count() or 4) // 4),
+                                  thread_name_prefix="transcribe")
+
+# Whisper model shared by all jobs, loaded at startup; model_lock also serializes inference
+whisper_model = None
+whisper_pipeline = None
+model_lock = threading.Lock()
+
+# Decoding presets for /api/transcribe?quality=; greedy decoding is the default for quick memos
+DECODE_OPTIONS = {
+    'fast': {'beam_size': 1, 'best_of': 1, 'temperature': 0.0, 'condition_on_previous_text': False},
+    'accurate': {'beam_size': 5, 'best_of': 5},
+}
+
+# faster-whisper cuts the audio at silences of at least this long (Silero VAD) and
+# decodes up to CHUNK_BATCH_SIZE of the resulting chunks in one batch
+VAD_PARAMETERS = {'min_silence_duration_ms': 500}
+CHUNK_BATCH_SIZE = 8
+
+def get_whisper_model():
+    """Load the Whisper model once; on CPU its weights run as int8."""
+    global whisper_model, whisper_pipeline
+    with model_lock:
+        if whisper_model is None and ONNX_WHISPER:
+            options = onnxruntime.SessionOptions()
+            options.intra_op_num_threads = CPU_THREADS
+            # Prefer the int8 files written by `optimum-cli onnxruntime quantize` next to the export
+            file_names = {}
+            for argument, stem in (('encoder_file_name', 'encoder_model'),
+                                   ('decoder_file_name', 'decoder_model'),
+                                   ('decoder_with_past_file_name', 'decoder_with_past_model')):
+                if os.path.exists(os.path.join(WHISPER_ONNX_MODEL, f"{stem}_quantized.onnx")):
+                    file_names[argument] = f"{stem}_quantized.onnx"
+            model = ORTModelForSpeechSeq2Seq.from_pretrained(
+                WHISPER_ONNX_MODEL, provider="CPUExecutionProvider", session_options=options, **file_names
+            )
+            processor = AutoProcessor.from_pretrained(WHISPER_ONNX_MODEL)
+            whisper_model = pipeline(
+                "automatic-speech-recognition", model=model, tokenizer=processor.tokenizer,
+                feature_extractor=processor.feature_extractor, chunk_length_s=30
+            )
+        elif whisper_model is None and FASTER_WHISPER:
+            whisper_model = WhisperModel("base", device="cpu", compute_type="int8", cpu_threads=CPU_THREADS)
+            if BatchedInferencePipeline is not None:
+                whisper_pipeline = BatchedInferencePipeline(model=whisper_model)
+        elif whisper_model is None:
+            model = whisper.load_model("base")
+            if model.device.type == "cpu":
+                model = quantize_openai_model(model)
+            whisper_model = model
+        return whisper_model
+
+def quantize_openai_model(model):
+    """
+    Dynamically quantize an openai-whisper model's Linear layers to int8.
+    
+    Its layers are whisper.model.Linear, and quantize_dynamic only swaps modules
+    whose exact type is nn.Linear, so they are turned into plain nn.Linear first;
+    on fp32 CPU inputs the two behave the same.
+    """
+    import torch
+    for module in model.modules():
+        if type(module) is whisper.model.Linear:
+            module.__class__ = torch.nn.Linear
+    quantized_model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    quantized = sum(isinstance(module, torch.ao.nn.quantized.dynamic.Linear)
+                    for module in quantized_model.modules())
+    if quantized == 0:
+        logger.warning("int8 quantization converted no Linear layers; using the fp32 model")
+        return model
+    logger.info("Quantized %d Linear layers to int8", quantized)
+    return quantized_model
+
+# Expected transcription time as a fraction of the audio length (Whisper base on CPU)
+REALTIME_FACTOR = 0.2
+
+def estimate_audio_seconds(path, audio=None):
+    """Return the length of an upload in seconds, guessing 128 kbps for compressed formats."""
+    if audio is not None:
+        return len(audio) / 16000
+    try:
+        with wave.open(path, 'rb') as wav:
+            return wav.getnframes() / wav.getframerate()
+    except (wave.Error, EOFError, ZeroDivisionError):
+        return os.path.getsize(path) / 16000
+
+def read_whisper_ready_wav(path):
+    """
+    Return the samples of a 16 kHz mono 16-bit WAV file as float32 in [-1, 1],
+    or None if the file needs ffmpeg to decode or resample it.
+    The file is memory-mapped, so the samples are converted straight from the page cache.
+    """
+    try:
+        with wave.open(path, 'rb') as wav:
+            if (wav.getframerate(), wav.getnchannels(), wav.getsampwidth()) != (16000, 1, 2):
+                return None
+            frames = wav.getnframes()
+    except (wave.Error, EOFError):
+        return None
+    import numpy as np
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        # Walk the RIFF chunks to where the sample data starts
+        offset = 12
+        while offset + 8 <= len(mapped):
+            size = int.from_bytes(mapped[offset + 4:offset + 8], 'little')
+            if mapped[offset:offset + 4] == b'data':
+                break
+            offset += 8 + size + (size & 1)
+        else:
+            return None
+        samples = np.frombuffer(mapped, dtype=np.int16, count=frames, offset=offset + 8)
+        audio = samples.astype(np.float32)
+        del samples  # The view must be gone before the map is closed
+    audio /= 32768.0
+    return audio
 
 class SimpleAudioHandler(BaseHTTPRequestHandler):
     def do_GET(self):
@@ -35,32 +286,29 @@ class SimpleAudioHandler(BaseHTTPRequestHandler):
             path = parsed_url.path
             
             if path == '/' or path == '/index.html':
+                gzipped = 'gzip' in self.headers.get('Accept-Encoding', '')
+                body = HTML_GZIP if gzipped else HTML_BYTES
                 self.send_response(200)
-                self.send_header('Content-type', 'text/html')
+                self.send_header('Content-type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('Cache-Control', 'public, max-age=3600')
+                self.send_header('Vary', 'Accept-Encoding')
+                if gzipped:
+                    self.send_header('Content-Encoding', 'gzip')
                 self.end_headers()
-                self.wfile.write(self.generate_html().encode())
+                self.wfile.write(body)
             elif path == '/api/job_status':
                 # Get job status
                 query_params = parse_qs(parsed_url.query)
                 job_id = query_params.get('job_id', [None])[0]
-                
-                if job_id and job_id in transcription_jobs:
-                    job = transcription_jobs[job_id]
-                    response = {
-                        'status': job['status'],
-                        'progress': job.get('progress', 0),
-                        'result': job.get('result', ''),
-                        'error': job.get('error', '')
-                    }
-                else:
-                    response = {'status': 'not_found', 'error': 'Job not found'}
-                
-                self.send_json_response(response)
+                self.send_json_response(job_snapshot(job_id))
+            elif path == '/api/job_stream':
+                query_params = parse_qs(parsed_url.query)
+                self.stream_job_status(query_params.get('job_id', [None])[0])
             else:
                 self.send_error(404)
         except Exception as e:
-            print(f"GET Error: {e}")
-            traceback.print_exc()
+            logger.exception("GET error: %s", e)
             self.send_error(500)
 
     def do_POST(self):
@@ -70,29 +318,74 @@ class SimpleAudioHandler(BaseHTTPRequestHandler):
             path = parsed_url.path
             
             if path == '/api/transcribe':
-                self.handle_file_transcription()
+                quality = parse_qs(parsed_url.query).get('quality', ['fast'])[0]
+                self.handle_file_transcription(quality if quality in DECODE_OPTIONS else 'fast')
             else:
                 self.send_error(404)
         except Exception as e:
-            print(f"POST Error: {e}")
-            traceback.print_exc()
+            logger.exception("POST error: %s", e)
             self.send_error(500)
 
-    def handle_file_transcription(self):
-        """Handle file upload and transcription."""
+    def stream_job_status(self, job_id):
+        """Push job updates as Server-Sent Events until the job is no longer processing."""
+        self.send_response(200)
+        self.send_header('Content-type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        
+        snapshot = job_snapshot(job_id)
+        try:
+            while True:
+                self.wfile.write(b"data: " + encode_json(snapshot) + b"\n\n")
+                self.wfile.flush()
+                sent_at = time.monotonic()
+                if snapshot['status'] != 'processing':
+                    break
+                # Estimated progress moves with the clock, so the job is re-checked every second;
+                # an unchanged state is resent after 15 s to keep the stream open
+                sent = snapshot
+                while snapshot == sent and time.monotonic() - sent_at < 15:
+                    with job_changed:
+                        job_changed.wait_for(lambda: job_snapshot(job_id) != sent, timeout=1)
+                    snapshot = job_snapshot(job_id)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def handle_file_transcription(self, quality='fast'):
+        """Handle file upload and transcription with the given DECODE_OPTIONS preset."""
         global job_counter
         
         try:
-            # Read the JSON data
+            # The body is the raw audio file; its name comes URL-encoded in X-Filename
             content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length).decode('utf-8')
-            data = json.loads(post_data)
+            filename = unquote(self.headers.get('X-Filename', '')) or 'audio.wav'
             
-            # Extract audio data
-            audio_data = base64.b64decode(data['audio'])
-            filename = data.get('filename', 'audio.wav')
+            ext = os.path.splitext(filename)[1].lower()
+            file_ext = ext if ext in ALLOWED_EXTENSIONS else '.wav'
             
-            print(f"Received file: {filename}, size: {len(audio_data)} bytes")
+            # Stream the body to a temporary file in 64 KB chunks instead of holding it in memory,
+            # hashing it on the way to spot repeat uploads
+            hasher = hashlib.blake2b(digest_size=16)
+            with tempfile.NamedTemporaryFile(suffix=file_ext, delete=False) as temp_file:
+                temp_path = temp_file.name
+                try:
+                    remaining = content_length
+                    while remaining > 0:
+                        chunk = self.rfile.read(min(65536, remaining))
+                        if not chunk:
+                            raise ValueError("Upload ended before Content-Length bytes were received")
+                        temp_file.write(chunk)
+                        hasher.update(chunk)
+                        remaining -= len(chunk)
+                except Exception:
+                    temp_file.close()
+                    os.unlink(temp_path)
+                    raise
+            
+            # The preset changes the transcript, so it is part of the cache key
+            digest = f"{hasher.hexdigest()}-{quality}"
+            logger.info("Received file: %s, size: %d bytes, saved to %s", filename, content_length, temp_path)
             
             # Create job
             with job_lock:
@@ -104,125 +397,130 @@ class SimpleAudioHandler(BaseHTTPRequestHandler):
                     'filename': filename
                 }
             
-            print(f"Created job {job_id} for file {filename}")
+            logger.info("Created job %s for file %s", job_id, filename)
             
-            # Start transcription in background
-            thread = threading.Thread(
-                target=self.transcribe_audio_file,
-                args=(job_id, audio_data, filename)
-            )
-            thread.daemon = True
-            thread.start()
+            cached_text = get_cached_result(digest)
+            if cached_text is not None:
+                # Same bytes as an earlier upload: reuse its transcript
+                os.unlink(temp_path)
+                update_job(job_id, status='completed', result=cached_text, progress=100)
+                logger.info("[Job %s] Reused transcript of an identical upload", job_id)
+            else:
+                # Queue transcription on the worker pool
+                job_executor.submit(self.transcribe_audio_file, job_id, temp_path, filename, digest, quality)
             
             # Return job ID
             response = {'job_id': job_id, 'status': 'started'}
             self.send_json_response(response)
             
         except Exception as e:
-            print(f"File transcription error: {e}")
-            traceback.print_exc()
+            logger.exception("File transcription error: %s", e)
             response = {'status': 'error', 'error': str(e)}
             self.send_json_response(response)
 
-    def transcribe_audio_file(self, job_id, audio_data, filename):
-        """Transcribe audio file in background thread."""
-        temp_path = None
+    def transcribe_audio_file(self, job_id, temp_path, filename, digest, quality):
+        """Transcribe an uploaded temporary audio file in a background thread; the file is removed afterwards."""
         try:
-            print(f"[Job {job_id}] Starting transcription for: {filename}")
+            logger.info("[Job %s] Starting transcription for: %s", job_id, filename)
             
             # Check if Whisper is available
             if not WHISPER_AVAILABLE:
-                transcription_jobs[job_id]['status'] = 'error'
-                transcription_jobs[job_id]['error'] = 'Whisper not available. Please install: pip install openai-whisper'
-                print(f"[Job {job_id}] Error: Whisper not available")
+                update_job(job_id, status='error', error='Whisper not available. Please install: pip install faster-whisper')
+                logger.error("[Job %s] Error: Whisper not available", job_id)
                 return
             
-            # Update progress
-            transcription_jobs[job_id]['progress'] = 10
-            print(f"[Job {job_id}] Progress: 10%")
-            
-            # Save audio data to temporary file
-            file_ext = '.wav'
-            if filename:
-                _, ext = os.path.splitext(filename.lower())
-                if ext in ['.mp3', '.wav', '.flac', '.m4a', '.ogg', '.webm']:
-                    file_ext = ext
-            
-            with tempfile.NamedTemporaryFile(suffix=file_ext, delete=False) as temp_file:
-                temp_file.write(audio_data)
-                temp_path = temp_file.name
-            
-            print(f"[Job {job_id}] Saved to temporary file: {temp_path}")
-            transcription_jobs[job_id]['progress'] = 30
-            print(f"[Job {job_id}] Progress: 30%")
-            
-            # Load Whisper model
-            print(f"[Job {job_id}] Loading Whisper model...")
-            transcription_jobs[job_id]['progress'] = 50
-            print(f"[Job {job_id}] Progress: 50%")
-            
             try:
-                model = whisper.load_model("base")
-                print(f"[Job {job_id}] Whisper model loaded successfully")
+                model = get_whisper_model()
+                logger.debug("[Job %s] Whisper model loaded successfully", job_id)
             except Exception as model_error:
-                print(f"[Job {job_id}] Failed to load Whisper model: {model_error}")
-                transcription_jobs[job_id]['status'] = 'error'
-                transcription_jobs[job_id]['error'] = f'Failed to load Whisper model: {model_error}'
+                logger.error("[Job %s] Failed to load Whisper model: %s", job_id, model_error)
+                update_job(job_id, status='error', error=f'Failed to load Whisper model: {model_error}')
                 return
             
-            transcription_jobs[job_id]['progress'] = 70
-            print(f"[Job {job_id}] Progress: 70%")
-            
             # Transcribe audio
-            print(f"[Job {job_id}] Starting transcription...")
             try:
-                result = model.transcribe(temp_path, fp16=False)
-                text = result["text"].strip()
+                # WAVs already in Whisper's input format skip the ffmpeg subprocess
+                audio = read_whisper_ready_wav(temp_path) if temp_path.endswith('.wav') else None
+                
+                # One job at a time uses the shared model
+                with model_lock:
+                    # Progress is estimated from here by job_snapshot
+                    logger.debug("[Job %s] Starting transcription...", job_id)
+                    update_job(job_id, started_at=time.monotonic(),
+                               expected_seconds=estimate_audio_seconds(temp_path, audio) * REALTIME_FACTOR)
+                    if ONNX_WHISPER:
+                        result = model(
+                            temp_path if audio is None else audio, batch_size=CHUNK_BATCH_SIZE,
+                            generate_kwargs={'num_beams': DECODE_OPTIONS[quality]['beam_size']}
+                        )
+                        text = result["text"].strip()
+                    elif FASTER_WHISPER and whisper_pipeline is not None:
+                        # Speech chunks are decoded side by side instead of one 30 s window at a time
+                        segments, _ = whisper_pipeline.transcribe(
+                            temp_path if audio is None else audio, batch_size=CHUNK_BATCH_SIZE,
+                            vad_parameters=VAD_PARAMETERS, **DECODE_OPTIONS[quality]
+                        )
+                        text = "".join(segment.text for segment in segments).strip()
+                    elif FASTER_WHISPER:
+                        # Segments are decoded lazily, so they are consumed under the lock
+                        segments, _ = model.transcribe(
+                            temp_path if audio is None else audio, vad_filter=True,
+                            vad_parameters=VAD_PARAMETERS, **DECODE_OPTIONS[quality]
+                        )
+                        text = "".join(segment.text for segment in segments).strip()
+                    else:
+                        result = model.transcribe(temp_path if audio is None else audio, fp16=False,
+                                                  **DECODE_OPTIONS[quality])
+                        text = result["text"].strip()
                 
                 if not text:
                     text = "No speech detected in the audio file."
                 
-                print(f"[Job {job_id}] Transcription completed: {len(text)} characters")
+                logger.info("[Job %s] Transcription completed: %d characters", job_id, len(text))
                     
             except Exception as transcribe_error:
-                print(f"[Job {job_id}] Transcription failed: {transcribe_error}")
-                traceback.print_exc()
-                transcription_jobs[job_id]['status'] = 'error'
-                transcription_jobs[job_id]['error'] = f'Transcription failed: {transcribe_error}'
+                logger.exception("[Job %s] Transcription failed: %s", job_id, transcribe_error)
+                update_job(job_id, status='error', error=f'Transcription failed: {transcribe_error}')
                 return
             
-            transcription_jobs[job_id]['progress'] = 90
-            print(f"[Job {job_id}] Progress: 90%")
-            
             # Update job with result
-            transcription_jobs[job_id]['status'] = 'completed'
-            transcription_jobs[job_id]['result'] = text
-            transcription_jobs[job_id]['progress'] = 100
+            store_cached_result(digest, text)
+            update_job(job_id, status='completed', result=text, progress=100)
             
-            print(f"[Job {job_id}] Job completed successfully!")
+            logger.info("[Job %s] Job completed successfully!", job_id)
             
         except Exception as e:
-            print(f"[Job {job_id}] Error: {e}")
-            traceback.print_exc()
-            transcription_jobs[job_id]['status'] = 'error'
-            transcription_jobs[job_id]['error'] = f'Transcription failed: {str(e)}'
+            logger.exception("[Job %s] Error: %s", job_id, e)
+            update_job(job_id, status='error', error=f'Transcription failed: {str(e)}')
         finally:
             # Clean up temporary file
             if temp_path and os.path.exists(temp_path):
                 try:
                     os.unlink(temp_path)
-                    print(f"[Job {job_id}] Cleaned up temporary file: {temp_path}")
+                    logger.debug("[Job %s] Cleaned up temporary file: %s", job_id, temp_path)
                 except Exception as cleanup_error:
-                    print(f"[Job {job_id}] Warning: Could not clean up temporary file: {cleanup_error}")
+                    logger.warning("[Job %s] Could not clean up temporary file: %s", job_id, cleanup_error)
+
+    def log_message(self, format, *args):
+        # Per-request access lines are only wanted when debugging
+        logger.debug("%s - %s", self.address_string(), format % args)
 
     def send_json_response(self, data):
         """Send JSON response."""
-        response_json = json.dumps(data)
+        body = encode_json(data)
+        # Long transcripts compress well; level 1 keeps the CPU cost negligible
+        gzipped = len(body) > 1024 and 'gzip' in self.headers.get('Accept-Encoding', '')
+        if gzipped:
+            body = gzip.compress(body, compresslevel=1)
         self.send_response(200)
         self.send_header('Content-type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Vary', 'Accept-Encoding')
+        if gzipped:
+            self.send_header('Content-Encoding', 'gzip')
         self.send_header('Access-Control-Allow-Origin', '*')
         self.end_headers()
-        self.wfile.write(response_json.encode())
+        self.wfile.write(body)
 
     def generate_html(self):
         """Generate the HTML content for the web interface."""
@@ -542,46 +840,72 @@ class SimpleAudioHandler(BaseHTTPRequestHandler):
                 return;
             }
             
-            console.log('Starting transcription for:', selectedFile.name);
+            console.log('Starting transcription for:', selectedFile.name, 'size:', selectedFile.size, 'bytes');
             
-            // Read file as base64
-            const reader = new FileReader();
-            reader.onload = function(e) {
-                const audioData = e.target.result.split(',')[1]; // Remove data:audio/...;base64, prefix
-                
-                console.log('Sending audio data, size:', audioData.length, 'characters');
-                
-                // Send to server
-                const data = {
-                    audio: audioData,
-                    filename: selectedFile.name
-                };
-                
-                fetch('/api/transcribe', {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json',
-                    },
-                    body: JSON.stringify(data)
-                })
-                .then(response => response.json())
-                .then(result => {
-                    console.log('Server response:', result);
-                    if (result.job_id) {
-                        currentJobId = result.job_id;
-                        showProgress();
-                        pollJobStatus();
-                    } else {
-                        showError('Failed to start transcription: ' + (result.error || 'Unknown error'));
-                    }
-                })
-                .catch(error => {
-                    console.error('Network error:', error);
-                    showError('Network error occurred: ' + error.message);
-                });
-            };
+            // Send the file as the raw request body; the name travels in a header
+            fetch('/api/transcribe', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/octet-stream',
+                    'X-Filename': encodeURIComponent(selectedFile.name)
+                },
+                body: selectedFile
+            })
+            .then(response => response.json())
+            .then(result => {
+                console.log('Server response:', result);
+                if (result.job_id) {
+                    currentJobId = result.job_id;
+                    showProgress();
+                    watchJobStatus();
+                } else {
+                    showError('Failed to start transcription: ' + (result.error || 'Unknown error'));
+                }
+            })
+            .catch(error => {
+                console.error('Network error:', error);
+                showError('Network error occurred: ' + error.message);
+            });
+        }
+        
+        function handleJobStatus(result) {
+            console.log('Job status:', result);
+            updateProgress(result.progress || 0, result.status);
+            
+            if (result.status === 'completed') {
+                hideProgress();
+                document.getElementById('resultText').value = result.result;
+                showSuccess('Transcription completed successfully!');
+                console.log('Transcription completed!');
+            } else if (result.status === 'error') {
+                hideProgress();
+                showError(`Transcription failed: ${result.error}`);
+                console.error('Transcription error:', result.error);
+            } else if (result.status === 'not_found') {
+                hideProgress();
+                showError('Error checking transcription status');
+            }
+            return result.status !== 'processing';
+        }
+        
+        function watchJobStatus() {
+            if (!currentJobId) return;
             
-            reader.readAsDataURL(selectedFile);
+            // The server pushes each progress change over one Server-Sent Events stream
+            const jobId = currentJobId;
+            const source = new EventSource(`/api/job_stream?job_id=${jobId}`);
+            source.onmessage = (event) => {
+                if (handleJobStatus(JSON.parse(event.data))) {
+                    source.close();
+                }
+            };
+            source.onerror = () => {
+                // Fall back to polling if the stream drops before the job finishes
+                source.close();
+                if (currentJobId === jobId) {
+                    pollJobStatus();
+                }
+            };
         }
         
         function pollJobStatus() {
@@ -590,20 +914,7 @@ class SimpleAudioHandler(BaseHTTPRequestHandler):
             fetch(`/api/job_status?job_id=${currentJobId}`)
                 .then(response => response.json())
                 .then(result => {
-                    console.log('Job status:', result);
-                    updateProgress(result.progress || 0, result.status);
-                    
-                    if (result.status === 'completed') {
-                        hideProgress();
-                        document.getElementById('resultText').value = result.result;
-                        showSuccess('Transcription completed successfully!');
-                        console.log('Transcription completed!');
-                    } else if (result.status === 'error') {
-                        hideProgress();
-                        showError(`Transcription failed: ${result.error}`);
-                        console.error('Transcription error:', result.error);
-                    } else if (result.status === 'processing') {
-                        // Continue polling
+                    if (!handleJobStatus(result)) {
                         setTimeout(pollJobStatus, 1000);
                     }
                 })
@@ -703,17 +1014,31 @@ class SimpleAudioHandler(BaseHTTPRequestHandler):
 </html>
         """
 
+# The page never changes, so it is built, encoded and compressed once
+HTML_BYTES = SimpleAudioHandler.generate_html(None).encode('utf-8')
+HTML_GZIP = gzip.compress(HTML_BYTES, compresslevel=9)
+
 def main():
     """Main function to start the server."""
     if WHISPER_AVAILABLE:
+        if not FASTER_WHISPER and not ONNX_WHISPER:
+            import torch
+            torch.set_num_threads(CPU_THREADS)
+            torch.set_num_interop_threads(1)
+        
+        # Load the model before serving so the first upload does not pay for it
+        print("Loading Whisper model...")
+        get_whisper_model()
         print("✅ Ready for transcription!")
     else:
-        print("❌ Whisper not available - please install: pip install openai-whisper")
+        print("❌ Whisper not available - please install: pip install faster-whisper")
         return
     
     # Start server
     server_address = ('localhost', 8081)
-    httpd = HTTPServer(server_address, SimpleAudioHandler)
+    # One thread per connection so uploads and event streams never block each other
+    httpd = ThreadingHTTPServer(server_address, SimpleAudioHandler)
+    threading.Thread(target=expire_jobs, daemon=True).start()
     
     print(f"\n🎵 Simple Audio to Text Converter started!")
     print(f"🌐 Open your browser and go to: http://localhost:8081")
@@ -723,10 +1048,13 @@ def main():
     print(f"  📋 Copy to clipboard functionality")
     print(f"\nPress Ctrl+C to stop the server")
     
+    _log_listener.start()
     try:
         httpd.serve_forever()
     except KeyboardInterrupt:
         print("\nServer stopped.")
+    finally:
+        _log_listener.stop()
 
 if __name__ == "__main__":
     main()